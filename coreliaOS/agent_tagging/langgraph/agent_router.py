@@ -1,8 +1,9 @@
 from langgraph.graph import StateGraph, END
 from typing import TypedDict, List, Dict, Any
+from functools import lru_cache
 from knowledge_base.models import AIAgent, Conversation
 from knowledge_base.views import agent_executor
-import re
+from .utils import split_agent_tag
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,6 +13,7 @@ class AgentState(TypedDict):
     message: str
     conversation_id: str
     agent_name: str
+    agent: Any
     response: Dict[str, Any]
 
 def extract_agent_name(state: AgentState) -> AgentState:
@@ -19,13 +21,11 @@ def extract_agent_name(state: AgentState) -> AgentState:
     Extract agent name from message using @agent_name pattern.
     """
     logger.info(f"Extracting agent name from message: {state['message']}")
-    match = re.search(r'@(\w+)', state['message'])
-    if match:
-        state['agent_name'] = match.group(1)
+    agent_name, cleaned_message = split_agent_tag(state['message'])
+    state['agent_name'] = agent_name
+    if agent_name:
         # Remove @agent_name from message
-        state['message'] = re.sub(r'@\w+', '', state['message']).strip()
-    else:
-        state['agent_name'] = None
+        state['message'] = cleaned_message
     logger.info(f"Extracted agent_name: {state['agent_name']}")
     return state
 
@@ -45,12 +45,16 @@ def validate_agent(state: AgentState) -> AgentState:
         return state
 
     try:
-        agent = AIAgent.objects.get(
+        # Load the full row: route_to_agent hands this instance to
+        # agent_executor, which reads the prompt and model configuration.
+        agent = AIAgent.objects.select_related('user').get(
             user_id=state['user_id'],
             name__iexact=state['agent_name'],
             is_active=True
         )
         logger.info(f"Found agent: {agent.name}")
+        # Hand the resolved agent to route_to_agent so it is not fetched twice
+        state['agent'] = agent
         return state
     except AIAgent.DoesNotExist:
         logger.error(f"Agent {state['agent_name']} not found or inactive for user {state['user_id']}")
@@ -71,14 +75,10 @@ def route_to_agent(state: AgentState) -> AgentState:
         return state
 
     logger.info(f"Routing to agent: {state['agent_name']}")
-    agent = AIAgent.objects.get(
-        user_id=state['user_id'],
-        name__iexact=state['agent_name'],
-        is_active=True
-    )
+    agent = state['agent']
     conversation = None
     if state['conversation_id']:
-        conversation = Conversation.objects.get(
+        conversation = Conversation.objects.select_related('agent', 'user').get(
             id=state['conversation_id'],
             user_id=state['user_id'],
             agent=agent
@@ -113,26 +113,38 @@ def build_graph():
     graph.add_node("validate_agent", validate_agent)
     graph.add_node("route_to_agent", route_to_agent)
 
-    graph.set_entry_point("extract_agent_name")
+    # Skip extraction when the caller has already parsed the tag
+    graph.set_conditional_entry_point(
+        lambda state: "validate_agent" if state['agent_name'] else "extract_agent_name",
+        ["extract_agent_name", "validate_agent"]
+    )
     graph.add_edge("extract_agent_name", "validate_agent")
     graph.add_edge("validate_agent", "route_to_agent")
     graph.add_edge("route_to_agent", END)
 
     return graph.compile()
 
-# Initialize the graph
-agent_router_graph = build_graph()
+@lru_cache(maxsize=1)
+def get_agent_router_graph():
+    """
+    Return the compiled agent router graph, building it on first use so each
+    worker process compiles it once rather than at import time.
+    """
+    return build_graph()
 
-def process_tagged_message(user_id: str, message: str, conversation_id: str = None) -> Dict[str, Any]:
+def process_tagged_message(user_id: str, message: str, conversation_id: str = None,
+                           agent_name: str = None) -> Dict[str, Any]:
     """
     Process a message with @agent_name tag and return the response.
+    If agent_name is given, message must already have its tags removed.
     """
-    state = AgentState(
-        user_id=user_id,
-        message=message,
-        conversation_id=conversation_id,
-        agent_name=None,
-        response={}
-    )
-    result = agent_router_graph.invoke(state)
+    state: AgentState = {
+        'user_id': user_id,
+        'message': message,
+        'conversation_id': conversation_id,
+        'agent_name': agent_name,
+        'agent': None,
+        'response': {}
+    }
+    result = get_agent_router_graph().invoke(state)
     return result['response']
\ No newline at end of file
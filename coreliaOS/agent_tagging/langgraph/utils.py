@@ -1,15 +1,30 @@
 import re
-from typing import Optional
+from typing import Optional, Tuple
+
+# Compiled once at import; shared by the LangGraph router and the views.
+AGENT_TAG_PATTERN = re.compile(r'@(\w+)')
 
 def extract_agent_tag(message: str) -> Optional[str]:
     """
     Extract agent name from message using @agent_name pattern.
     """
-    match = re.search(r'@(\w+)', message)
+    match = AGENT_TAG_PATTERN.search(message)
     return match.group(1) if match else None
 
 def clean_message(message: str) -> str:
     """
     Remove @agent_name tags from the message.
     """
-    return re.sub(r'@\w+', '', message).strip()
\ No newline at end of file
+    return AGENT_TAG_PATTERN.sub('', message).strip()
+
+def split_agent_tag(message: str) -> Tuple[Optional[str], str]:
+    """
+    Return the first tagged agent name and the message with all tags removed.
+    The text before the first match is already tag-free, so only the
+    remainder is scanned again.
+    """
+    match = AGENT_TAG_PATTERN.search(message)
+    if not match:
+        return None, message
+    cleaned = message[:match.start()] + AGENT_TAG_PATTERN.sub('', message[match.end():])
+    return match.group(1), cleaned.strip()
\ No newline at end of file
@@ -13,13 +13,15 @@ class GetGroupSerializer(serializers.Serializer):
             group = CreateGroupModel.objects.get(grp_id=value, user=user)
         except CreateGroupModel.DoesNotExist:
             raise serializers.ValidationError(f"Group with grp_id {value} not found or does not belong to the user")
+        # Keep the instance so get_group_data() does not query it again
+        self._group = group
         return value
 
     def get_group_data(self):
         """
         Return the group data in the specified format.
         """
-        group = CreateGroupModel.objects.get(grp_id=self.validated_data['grp_id'], user=self.context['request'].user)
+        group = self._group
         return {
             'grp_id': str(group.grp_id),
             'name': group.name,
@@ -4,28 +4,50 @@ from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.forms.models import model_to_dict
 from django.core.exceptions import ValidationError
-import json
+import orjson
 from .models import CreateGroupModel
 from .langgraph.agent_router import process_tagged_message
+from .langgraph.utils import split_agent_tag
+from knowledge_base.ai_agents import ConversationMemory
 from knowledge_base.models import AIAgent, Conversation
 from knowledge_base.views import agent_executor
 from django.contrib.auth.models import User
 from django.db.models import Q
 import logging
 from .serializers import *
-from django.db import transaction
+from django.db import connection, transaction
+from concurrent.futures import ThreadPoolExecutor
 from django.shortcuts import get_object_or_404
-import re
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent agent requests for a single group message
+MAX_GROUP_WORKERS = 8
+
+
+def _execute_agent_request(agent, message, conversation, conversation_history):
+    """Run one agent request on a worker thread and release its DB connection.
+
+    The exchange is not saved here; the caller records it once every agent
+    has answered.
+    """
+    logger.info(f"Executing agent request for agent {agent.name}")
+    try:
+        return agent_executor.execute_agent_request(
+            agent, message, conversation,
+            conversation_history=conversation_history, persist=False
+        )
+    finally:
+        connection.close()
+
+
 @csrf_exempt
 @login_required
 @require_http_methods(["POST"])
 def create_agent_group(request):
     """Create a new agent group for the logged-in user"""
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
 
         # Validate required fields
         required_fields = ['name', 'agent_labels']
@@ -45,14 +67,13 @@ def create_agent_group(request):
             }, status=400)
 
         # Fetch user agents with case-insensitive matching
-        user_agents = AIAgent.objects.filter(user=request.user)
-        valid_agent_names = set(user_agents.values_list('name', flat=True))
+        valid_agent_names = set(
+            AIAgent.objects.filter(user=request.user).values_list('name', flat=True)
+        )
         
         # Perform case-insensitive validation
-        invalid_labels = []
-        for label in agent_labels:
-            if not any(label.lower() == name.lower() for name in valid_agent_names):
-                invalid_labels.append(label)
+        valid_names_lower = {name.lower() for name in valid_agent_names}
+        invalid_labels = [label for label in agent_labels if label.lower() not in valid_names_lower]
         
         if invalid_labels:
             return JsonResponse({
@@ -78,7 +99,7 @@ def create_agent_group(request):
             'message': 'Agent group created successfully'
         })
 
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         return JsonResponse({
             'success': False,
             'error': 'Invalid JSON in request body'
@@ -105,7 +126,7 @@ def get_agent_group(request):
     Returns: {"grp_id": "<uuid>", "name": "<name>", "agents": ["agent1", "agent2"]}
     """
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
         logger.info(f"Request data: {data}")
 
         serializer = GetGroupSerializer(data=data, context={'request': request})
@@ -125,7 +146,7 @@ def get_agent_group(request):
             'message': 'Agent group retrieved successfully'
         })
 
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         logger.error("Invalid JSON in request body")
         return JsonResponse({
             'success': False,
@@ -149,7 +170,7 @@ def send_group_message(request):
     Returns aggregated responses from group agents or a single tagged agent's response.
     """
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
         grp_id = data.get('grp_id')
         message = data.get('message')
         conversation_id = data.get('conversation_id')
@@ -164,22 +185,24 @@ def send_group_message(request):
         # Retrieve the group
         group = get_object_or_404(CreateGroupModel, grp_id=grp_id, user=request.user)
         logger.info(f"Found group {grp_id} for user {request.user.id}")
+        group_labels_lower = frozenset(name.lower() for name in group.agent_labels)
 
         # Check if the message contains an @agent_name tag
-        tagged_agent = re.search(r'@(\w+)', message)
+        tagged_agent, cleaned_message = split_agent_tag(message)
         if tagged_agent:
             # Use LangGraph flow for tagged messages
             logger.info(f"Detected tagged message: {message}")
             response = process_tagged_message(
                 user_id=str(request.user.id),
-                message=message,
-                conversation_id=conversation_id
+                message=cleaned_message,
+                conversation_id=conversation_id,
+                agent_name=tagged_agent
             )
             logger.info(f"Tagged message response: {response}")
 
             # Validate that the tagged agent is in the group
             agent_name = response.get('agent_name')
-            if agent_name and agent_name.lower() not in [name.lower() for name in group.agent_labels]:
+            if agent_name and agent_name.lower() not in group_labels_lower:
                 logger.error(f"Tagged agent {agent_name} not in group {grp_id}")
                 return JsonResponse({
                     'success': False,
@@ -212,7 +235,8 @@ def send_group_message(request):
         conversation = None
         if conversation_id:
             conversation = get_object_or_404(
-                Conversation, id=conversation_id, user=request.user
+                Conversation.objects.select_related('agent', 'user'),
+                id=conversation_id, user=request.user
             )
             logger.info(f"Found conversation {conversation_id} for user {request.user.id}")
         else:
@@ -224,11 +248,31 @@ def send_group_message(request):
                 )
             logger.info(f"Created new conversation {conversation.id} for group {grp_id}")
 
-        # Execute message for each agent
+        # Snapshot the history once, before any agent writes, so every agent
+        # sees the conversation as it was when the message arrived
+        recent_messages = list(conversation.messages.order_by('created_at'))
+        histories = [
+            ConversationMemory(conversation, {
+                'mode': agent.conversation_mode,
+                'max_tokens': agent.context_window
+            }).get_conversation_history(recent_messages)
+            for agent in agents
+        ]
+
+        # Execute message for each agent concurrently; the calls are independent
+        # LLM round-trips, so latency is bounded by the slowest agent
         responses = []
-        for agent in agents:
-            logger.info(f"Executing agent request for agent {agent.name}")
-            response = agent_executor.execute_agent_request(agent, message, conversation)
+        with ThreadPoolExecutor(max_workers=min(MAX_GROUP_WORKERS, len(agents))) as executor:
+            futures = [
+                (agent, executor.submit(_execute_agent_request, agent, message, conversation, history))
+                for agent, history in zip(agents, histories)
+            ]
+        # Save the exchanges in agent order, so the stored conversation does
+        # not depend on which agent finished first
+        for agent, future in futures:
+            response = future.result()
+            if not response.get('error'):
+                agent_executor.record_exchange(agent, conversation, message, response)
             responses.append({
                 'agent_name': agent.name,
                 'response': response.get('content', ''),
@@ -247,13 +291,13 @@ def send_group_message(request):
                 'response': [r['response'] for r in responses],  # Aggregate responses
                 'conversation_id': str(conversation.id),
                 'context_docs': [doc for r in responses for doc in r['context_docs']],
-                'usage': {agent.name: r['usage'] for agent in agents for r in responses if r['agent_name'] == agent.name},
+                'usage': {r['agent_name']: r['usage'] for r in responses},
                 'response_time': sum(r['response_time'] for r in responses) / len(responses) if responses else 0
             },
             'error': None
         })
 
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         logger.error("Invalid JSON in request body")
         return JsonResponse({
             'success': False,
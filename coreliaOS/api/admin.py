@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db.models import Count
 from django.utils.html import format_html
 import json
 from .models import BusinessBrand, SocialMediaPost, InstagramPost, ContentCalendar, ContentIdea
@@ -56,8 +57,9 @@ class ContentCalendarAdmin(admin.ModelAdmin):
     
     def content_idea_count(self, obj):
         """Get content idea count for calendar"""
-        return obj.content_ideas.count()
+        return obj.idea_count
     content_idea_count.short_description = 'Ideas'
+    content_idea_count.admin_order_field = 'idea_count'
     
     def business_profile_data_display(self, obj):
         """Display business profile data in formatted way"""
@@ -71,7 +73,9 @@ class ContentCalendarAdmin(admin.ModelAdmin):
     
     def get_queryset(self, request):
         """Optimize queryset"""
-        return super().get_queryset(request).select_related('user')
+        return super().get_queryset(request).select_related('user').annotate(
+            idea_count=Count('content_ideas')
+        )
 
 
 @admin.register(ContentIdea)
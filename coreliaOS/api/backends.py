@@ -0,0 +1,25 @@
+"""
+Authentication backends for the API app
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+User = get_user_model()
+
+
+class BusinessBrandModelBackend(ModelBackend):
+    """
+    ModelBackend that loads the user's BusinessBrand in the same query.
+    
+    Brand, logo and post endpoints read request.user.business_brand on
+    nearly every request; select_related caches it (or its absence) on
+    the user, so get_business_profile_for_user does not issue a second
+    SELECT.
+    """
+    
+    def get_user(self, user_id):
+        try:
+            user = User._default_manager.select_related('business_brand').get(pk=user_id)
+        except User.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
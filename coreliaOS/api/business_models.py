@@ -34,7 +34,11 @@ class Business(models.Model):
     
     def check_password(self, raw_password):
         """Check if the provided password matches the stored hash"""
-        return check_password(raw_password, self.password)
+        def setter(raw_password):
+            # Rehash with the preferred hasher when the stored hash is outdated
+            self.set_password(raw_password)
+            Business.objects.filter(pk=self.pk).update(password=self.password)
+        return check_password(raw_password, self.password, setter)
 
 
 class BusinessProfile(models.Model):
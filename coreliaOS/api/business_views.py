@@ -1,25 +1,106 @@
-from django.http import JsonResponse
+from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from .business_models import Business, BusinessProfile
-import json
+from .helpers import OrjsonResponse, queue_staged_file_task, stage_uploaded_file
+from .tasks import upload_business_logo
+import orjson
 import logging
-import traceback
+from functools import lru_cache
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+# Session key holding the identity fields echoed back by the auth endpoints
+BUSINESS_SESSION_CACHE_KEY = 'business_cache'
+
+# Seconds a serialized business profile stays cached
+BUSINESS_PROFILE_CACHE_TIMEOUT = 3600
+
+# Failed login attempts allowed per email and client IP within each window (seconds)
+BUSINESS_LOGIN_RATE_LIMIT = 5
+BUSINESS_LOGIN_RATE_WINDOW = 60
+
+# Profile fields that business_profile_update_api accepts from POST data
+BUSINESS_PROFILE_UPDATABLE_FIELDS = frozenset([
+    'business_name', 'website_url', 'instagram_handle',
+    'primary_color', 'secondary_color', 'accent_color', 'font_family',
+    'brand_mission', 'brand_values', 'business_basic_details',
+    'business_services', 'business_additional_details'
+])
+
+
+def _cache_business_identity(request, business):
+    """Store the business identity in the session and return it"""
+    # Session data is JSON-serialized, so the UUID is stored as a string
+    identity = {
+        'id': str(business.id),
+        'first_name': business.first_name,
+        'last_name': business.last_name,
+        'email': business.email,
+    }
+    request.session[BUSINESS_SESSION_CACHE_KEY] = identity
+    return identity
+
+
+def _client_ip(request):
+    """
+    Client address as seen by the proxy in front of Django.
+    
+    Kong appends the address it received the request from to
+    X-Forwarded-For, so the last entry is the only one a client cannot
+    forge; REMOTE_ADDR is the proxy itself.
+    """
+    forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if forwarded_for:
+        return forwarded_for.rsplit(',', 1)[-1].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _login_attempts_key(request, email):
+    """Cache key counting failed logins for this email and client IP"""
+    return f"business_login_attempts:{_client_ip(request)}:{str(email).lower()}"
+
+
+def _login_rate_limited(attempts_key):
+    """True once this email and client IP have used up their failed attempts"""
+    return (cache.get(attempts_key) or 0) >= BUSINESS_LOGIN_RATE_LIMIT
+
+
+def _record_failed_login(attempts_key):
+    """Count a failed login; the window starts at the first failure"""
+    cache.add(attempts_key, 0, BUSINESS_LOGIN_RATE_WINDOW)
+    try:
+        cache.incr(attempts_key)
+    except ValueError:
+        # The key expired between add() and incr(); start a new window
+        cache.set(attempts_key, 1, BUSINESS_LOGIN_RATE_WINDOW)
+
+
+@lru_cache(maxsize=None)
+def _error_body(message):
+    """Encode a fixed error payload once; only called with literal messages"""
+    return orjson.dumps({'error': message, 'status': 'error'})
+
+
+def _error_response(message, status):
+    """Build an error response for a fixed message from its cached body"""
+    return HttpResponse(_error_body(message), status=status, content_type='application/json')
+
 
 @csrf_exempt
 @require_http_methods(["POST"])
 def business_register_api(request):
     """Business user registration API endpoint"""
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
+        if not isinstance(data, dict):
+            return _error_response('Invalid JSON data', 400)
         first_name = data.get('first_name')
         last_name = data.get('last_name')
         email = data.get('email')
@@ -27,69 +108,49 @@ def business_register_api(request):
         
         # Validation
         if not first_name or not last_name or not email or not password:
-            return JsonResponse({
-                'error': 'First name, last name, email, and password are required',
-                'status': 'error'
-            }, status=400)
+            return _error_response('First name, last name, email, and password are required', 400)
         
         # Validate email
         try:
             validate_email(email)
         except ValidationError:
-            return JsonResponse({
-                'error': 'Invalid email format',
-                'status': 'error'
-            }, status=400)
-        
-        # Check if email already exists
-        if Business.objects.filter(email=email).exists():
-            return JsonResponse({
-                'error': 'Email already registered',
-                'status': 'error'
-            }, status=400)
+            return _error_response('Invalid email format', 400)
         
         # Use database transaction to ensure atomicity
-        with transaction.atomic():
-            # Create business user
-            business = Business(
-                first_name=first_name,
-                last_name=last_name,
-                email=email
-            )
-            business.set_password(password)
-            business.save()
-            
-            # Create empty business profile
-            BusinessProfile.objects.create(business=business)
+        try:
+            with transaction.atomic():
+                # Create business user
+                business = Business(
+                    first_name=first_name,
+                    last_name=last_name,
+                    email=email
+                )
+                business.set_password(password)
+                business.save()
+                
+                # Create empty business profile
+                BusinessProfile.objects.create(business=business)
+        except IntegrityError:
+            # The unique constraint on email rejects duplicate registrations
+            return _error_response('Email already registered', 400)
         
-        # Store business ID in session
-        request.session['business_id'] = str(business.id)
+        # Store business ID in session (saved by the session middleware)
+        identity = _cache_business_identity(request, business)
+        request.session['business_id'] = identity['id']
         request.session['user_type'] = 'business'
-        request.session.save()
         
-        return JsonResponse({
+        return OrjsonResponse({
             'message': 'Business account created successfully',
             'status': 'success',
-            'business': {
-                'id': str(business.id),
-                'first_name': business.first_name,
-                'last_name': business.last_name,
-                'email': business.email,
-            }
+            'business': identity
         }, status=201)
     
-    except json.JSONDecodeError as e:
-        logger.error(f"JSON decode error in business_register_api: {str(e)}\n{traceback.format_exc()}")
-        return JsonResponse({
-            'error': 'Invalid JSON data',
-            'status': 'error'
-        }, status=400)
+    except orjson.JSONDecodeError as e:
+        logger.exception("JSON decode error in business_register_api: %s", e)
+        return _error_response('Invalid JSON data', 400)
     except Exception as e:
-        logger.error(f"Exception in business_register_api: {str(e)}\n{traceback.format_exc()}")
-        return JsonResponse({
-            'error': 'Registration failed. Please try again.',
-            'status': 'error'
-        }, status=500)
+        logger.exception("Exception in business_register_api: %s", e)
+        return _error_response('Registration failed. Please try again.', 500)
 
 
 @csrf_exempt
@@ -97,51 +158,51 @@ def business_register_api(request):
 def business_login_api(request):
     """Business user login API endpoint"""
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
+        if not isinstance(data, dict):
+            return _error_response('Invalid JSON data', 400)
         email = data.get('email')
         password = data.get('password')
         
         if not email or not password:
-            return JsonResponse({
-                'error': 'Email and password are required',
-                'status': 'error'
-            }, status=400)
+            return _error_response('Email and password are required', 400)
+        
+        # Throttle before any password hashing happens
+        attempts_key = _login_attempts_key(request, email)
+        if _login_rate_limited(attempts_key):
+            return _error_response('Too many login attempts. Please try again later.', 429)
         
         # Find business by email
         try:
-            business = Business.objects.get(email=email, is_active=True)
+            business = Business.objects.only(
+                'id', 'first_name', 'last_name', 'email', 'password', 'is_active'
+            ).get(email=email, is_active=True)
         except Business.DoesNotExist:
-            return JsonResponse({
-                'error': 'Invalid credentials',
-                'status': 'error'
-            }, status=401)
+            _record_failed_login(attempts_key)
+            return _error_response('Invalid credentials', 401)
         
         # Check password
         if not business.check_password(password):
-            return JsonResponse({
-                'error': 'Invalid credentials',
-                'status': 'error'
-            }, status=401)
+            _record_failed_login(attempts_key)
+            return _error_response('Invalid credentials', 401)
         
-        # Update last login
-        business.last_login = timezone.now()
-        business.save()
+        # Only failures count toward the limit; a successful login clears them
+        cache.delete(attempts_key)
+        
+        # Update last login with a single-column UPDATE
+        Business.objects.filter(pk=business.pk).update(last_login=timezone.now())
         
         # Store business ID in session
-        request.session['business_id'] = str(business.id)
+        identity = _cache_business_identity(request, business)
+        request.session['business_id'] = identity['id']
         request.session['user_type'] = 'business'
         request.session.save()
         
         
-        response = JsonResponse({
+        response = OrjsonResponse({
             'message': 'Login successful',
             'status': 'success',
-            'business': {
-                'id': str(business.id),
-                'first_name': business.first_name,
-                'last_name': business.last_name,
-                'email': business.email,
-            }
+            'business': identity
         })
         
         # Ensure session cookie is set properly for cross-origin requests
@@ -156,14 +217,11 @@ def business_login_api(request):
         
         return response
     
-    except json.JSONDecodeError:
-        return JsonResponse({
-            'error': 'Invalid JSON data',
-            'status': 'error'
-        }, status=400)
+    except orjson.JSONDecodeError:
+        return _error_response('Invalid JSON data', 400)
     except Exception as e:
-        logger.error(f"Exception in business_login_api: {str(e)}\n{traceback.format_exc()}")
-        return JsonResponse({
+        logger.exception("Exception in business_login_api: %s", e)
+        return OrjsonResponse({
             'error': str(e),
             'status': 'error'
         }, status=500)
@@ -177,15 +235,10 @@ def business_logout_api(request):
         del request.session['business_id']
         if 'user_type' in request.session:
             del request.session['user_type']
-        return JsonResponse({
-            'message': 'Logout successful',
-            'status': 'success'
-        })
+        request.session.pop(BUSINESS_SESSION_CACHE_KEY, None)
+        return HttpResponse(status=204)
     else:
-        return JsonResponse({
-            'error': 'Not authenticated',
-            'status': 'error'
-        }, status=401)
+        return _error_response('Not authenticated', 401)
 
 
 @require_http_methods(["GET"])
@@ -196,23 +249,23 @@ def business_profile_api(request):
     
     if not business_id:
         logger.warning("[Business Profile API] No business_id in session")
-        return JsonResponse({
-            'error': 'Not authenticated',
-            'status': 'error'
-        }, status=401)
+        return _error_response('Not authenticated', 401)
     
     try:
-        business = Business.objects.get(id=business_id, is_active=True)
-        
-        profile = BusinessProfile.objects.get(business=business)
+        profile = BusinessProfile.objects.select_related('business').get(
+            business_id=business_id, business__is_active=True
+        )
+        business = profile.business
         
-        profile_dict = profile.to_dict()
+        # updated_at is part of the key, so any profile save invalidates it
+        cache_key = f"business_profile:{profile.pk}:{profile.updated_at.timestamp()}"
+        profile_dict = cache.get_or_set(cache_key, profile.to_dict, BUSINESS_PROFILE_CACHE_TIMEOUT)
         
         response_data = {
             'message': 'Profile retrieved successfully',
             'status': 'success',
             'business': {
-                'id': str(business.id),
+                'id': business.id,
                 'first_name': business.first_name,
                 'last_name': business.last_name,
                 'email': business.email,
@@ -220,26 +273,14 @@ def business_profile_api(request):
             },
             'profile': profile_dict
         }
-        return JsonResponse(response_data)
+        return OrjsonResponse(response_data)
         
-    except Business.DoesNotExist:
-        logger.error(f"[Business Profile API] Business not found for ID: {business_id}")
-        return JsonResponse({
-            'error': 'Business not found',
-            'status': 'error'
-        }, status=404)
     except BusinessProfile.DoesNotExist:
-        logger.error(f"[Business Profile API] Profile not found for business ID: {business_id}")
-        return JsonResponse({
-            'error': 'Profile not found',
-            'status': 'error'
-        }, status=404)
+        logger.error("[Business Profile API] Profile not found for business ID: %s", business_id)
+        return _error_response('Profile not found', 404)
     except Exception as e:
-        logger.error(f"[Business Profile API] Exception: {str(e)}\n{traceback.format_exc()}")
-        return JsonResponse({
-            'error': 'Failed to retrieve profile',
-            'status': 'error'
-        }, status=500)
+        logger.exception("[Business Profile API] Exception: %s", e)
+        return _error_response('Failed to retrieve profile', 500)
 
 
 @csrf_exempt
@@ -249,68 +290,70 @@ def business_profile_update_api(request):
     business_id = request.session.get('business_id')
     
     if not business_id:
-        return JsonResponse({
-            'error': 'Not authenticated',
-            'status': 'error'
-        }, status=401)
+        return _error_response('Not authenticated', 401)
     
     try:
-        business = Business.objects.get(id=business_id, is_active=True)
-        profile, created = BusinessProfile.objects.get_or_create(business=business)
+        try:
+            profile = BusinessProfile.objects.select_related('business').get(
+                business_id=business_id, business__is_active=True
+            )
+            business = profile.business
+        except BusinessProfile.DoesNotExist:
+            business = Business.objects.get(id=business_id, is_active=True)
+            profile, created = BusinessProfile.objects.get_or_create(business=business)
         
         # Handle file upload (logo)
         logo_file = request.FILES.get('logo')
+        staged_logo_path = None
         
         if logo_file:
-            # Use the same S3 service as business profile tab
+            # Stage the file locally; the S3 upload runs in a Celery task
             try:
                 from services.s3_service import s3_service
                 
-                logo_url = s3_service.upload_business_logo(logo_file, business.id)
-                if not logo_url:
-                    return JsonResponse({
-                        'error': 'Failed to upload logo. Please try again.',
-                        'status': 'error'
-                    }, status=500)
+                if not s3_service.is_available() or not s3_service.is_valid_image(logo_file.name):
+                    return _error_response('Failed to upload logo. Please try again.', 500)
                 
-                profile.logo_url = logo_url
+                staged_logo_path = stage_uploaded_file(logo_file, 'logos')
                 
             except Exception as e:
-                logger.error(f"Logo upload error: {str(e)}")
-                return JsonResponse({
-                    'error': 'Failed to upload logo',
-                    'status': 'error'
-                }, status=500)
-        
-        # Update profile fields from POST data
-        updatable_fields = [
-            'business_name', 'website_url', 'instagram_handle',
-            'primary_color', 'secondary_color', 'accent_color', 'font_family',
-            'brand_mission', 'brand_values', 'business_basic_details',
-            'business_services', 'business_additional_details'
-        ]
+                logger.error("Logo upload error: %s", e)
+                return _error_response('Failed to upload logo', 500)
         
-        for field in updatable_fields:
+        # Update profile fields from POST data, writing only changed columns
+        changed_fields = []
+        for field in BUSINESS_PROFILE_UPDATABLE_FIELDS:
             value = request.POST.get(field)
-            if value is not None:
+            if value is not None and getattr(profile, field) != value:
                 setattr(profile, field, value)
+                changed_fields.append(field)
         
-        profile.save()
+        if changed_fields:
+            profile.save(update_fields=changed_fields + ['updated_at'])
         
-        return JsonResponse({
+        logo_upload_pending = bool(staged_logo_path) and queue_staged_file_task(
+            upload_business_logo, staged_logo_path,
+            str(profile.id), str(business.id), staged_logo_path
+        )
+        
+        # Refresh the identity served by business_auth_status_api
+        _cache_business_identity(request, business)
+        
+        response_data = {
             'message': 'Profile updated successfully',
             'status': 'success',
-            'profile': profile.to_dict()
-        })
+            'profile': profile.to_dict(),
+            'logo_upload_pending': logo_upload_pending
+        }
+        if staged_logo_path and not logo_upload_pending:
+            response_data['logo_error'] = 'Logo upload could not be started. Please try again.'
+        return OrjsonResponse(response_data)
     
     except Business.DoesNotExist:
-        return JsonResponse({
-            'error': 'Business not found',
-            'status': 'error'
-        }, status=404)
+        return _error_response('Business not found', 404)
     except Exception as e:
-        logger.error(f"Exception in business_profile_update_api: {str(e)}\n{traceback.format_exc()}")
-        return JsonResponse({
+        logger.exception("Exception in business_profile_update_api: %s", e)
+        return OrjsonResponse({
             'error': f'Failed to update profile: {str(e)}',
             'status': 'error'
         }, status=500)
@@ -325,28 +368,35 @@ def business_auth_status_api(request):
     
     if business_id and user_type == 'business':
         try:
-            business = Business.objects.get(id=business_id, is_active=True)
+            identity = request.session.get(BUSINESS_SESSION_CACHE_KEY)
+            if identity and identity.get('id') == business_id:
+                # The cached identity skips the row fetch, but a deactivated
+                # business must still stop reading as logged in
+                if not Business.objects.filter(id=business_id, is_active=True).exists():
+                    request.session.pop(BUSINESS_SESSION_CACHE_KEY, None)
+                    raise Business.DoesNotExist
+            else:
+                # Sessions created before the identity cache existed
+                business = Business.objects.only(
+                    'id', 'first_name', 'last_name', 'email', 'is_active'
+                ).get(id=business_id, is_active=True)
+                identity = _cache_business_identity(request, business)
             response_data = {
                 'authenticated': True,
                 'user_type': 'business',
                 'status': 'success',
-                'business': {
-                    'id': str(business.id),
-                    'first_name': business.first_name,
-                    'last_name': business.last_name,
-                    'email': business.email,
-                }
+                'business': identity
             }
-            return JsonResponse(response_data)
+            return OrjsonResponse(response_data)
         except Business.DoesNotExist:
-            logger.warning(f"[Business Auth Status] Business not found for ID: {business_id}")
-            return JsonResponse({
+            logger.warning("[Business Auth Status] Business not found for ID: %s", business_id)
+            return OrjsonResponse({
                 'authenticated': False,
                 'status': 'success',
                 'message': 'Business not found'
             })
     else:
-        return JsonResponse({
+        return OrjsonResponse({
             'authenticated': False,
             'status': 'success',
             'message': 'Not authenticated'
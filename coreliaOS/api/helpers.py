@@ -1,16 +1,70 @@
 """
 Helper functions for API responses and business logic
 """
-from django.http import JsonResponse
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import HttpResponse
 from django.utils import timezone
+import hashlib
+import httpx
 import logging
 import json
+import openai
+import orjson
 import os
+import re
+import uuid
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Optional, Dict, Any, Tuple
+from knowledge_base.instagram_utils.encryption import token_encryption
+from knowledge_base.instagram_utils.instagram_api import InstagramAPIClient
+from knowledge_base.models import Conversation, ConnectedAccount
+from services.s3_service import s3_service
+from .business_models import BusinessProfile
 from .models import BusinessBrand, SocialMediaPost
 
 logger = logging.getLogger(__name__)
 
+# Non-string keys are stringified, as json.dumps does; numpy values can come
+# from layout generation
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+_django_json_default = DjangoJSONEncoder().default
+
+# Seconds a business profile generation dict stays cached; saves to
+# BusinessProfile invalidate it earlier (see api.signals)
+BUSINESS_PROFILE_CACHE_TIMEOUT = 300
+
+# Seconds a successful validate_token() verdict is reused for the same token
+INSTAGRAM_TOKEN_VALIDATION_TIMEOUT = 300
+
+# File extensions determine_media_type accepts for each media type
+IMAGE_EXTENSIONS = frozenset(['.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg'])
+VIDEO_EXTENSIONS = frozenset(['.mp4', '.mov', '.avi', '.mkv', '.webm'])
+
+
+class OrjsonResponse(HttpResponse):
+    """
+    JsonResponse counterpart that serializes with orjson.
+    
+    UUID and datetime values are encoded natively, so they do not need to be
+    converted to strings first. Types orjson does not know (Decimal, lazy
+    translation strings, timedelta) fall back to DjangoJSONEncoder, matching
+    what JsonResponse accepts.
+    """
+    
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        content = orjson.dumps(data, default=_django_json_default, option=ORJSON_OPTIONS)
+        super().__init__(content=content, **kwargs)
+        # Kept so callers can inspect the payload without re-parsing content
+        self.data = data
+
+
 def create_json_response(message, data=None, status='success', status_code=200):
     """
     Create a standardized JSON response
@@ -22,7 +76,7 @@ def create_json_response(message, data=None, status='success', status_code=200):
         status_code (int): HTTP status code
     
     Returns:
-        JsonResponse: Standardized JSON response
+        OrjsonResponse: Standardized JSON response
     """
     response_data = {
         'status': status,
@@ -32,11 +86,11 @@ def create_json_response(message, data=None, status='success', status_code=200):
     if data is not None:
         response_data['data'] = data
     
-    logger.info(f"📤 Creating JSON response - Status: {status_code}, Message: {message}")
+    logger.info("📤 Creating JSON response - Status: %s, Message: %s", status_code, message)
     if status_code >= 400:
-        logger.warning(f"⚠️  Error response being sent: {response_data}")
+        logger.warning("⚠️  Error response being sent: %s", response_data)
     
-    return JsonResponse(response_data, status=status_code)
+    return OrjsonResponse(response_data, status=status_code)
 
 def handle_exception(exception, message="An error occurred"):
     """
@@ -47,9 +101,9 @@ def handle_exception(exception, message="An error occurred"):
         message (str): Custom error message
     
     Returns:
-        JsonResponse: Error response
+        OrjsonResponse: Error response
     """
-    logger.error(f"💥 Exception handled - {message}: {str(exception)}", exc_info=True)
+    logger.error("💥 Exception handled - %s: %s", message, exception, exc_info=True)
     return create_json_response(
         message=message,
         status='error',
@@ -81,6 +135,42 @@ def get_business_profile_for_user(user, allow_none: bool = False) -> Optional[Bu
         raise
 
 
+def business_profile_cache_key(business_id) -> str:
+    """Cache key for the generation profile dict of a business"""
+    return f"business_profile_generation:{business_id}"
+
+
+# BusinessProfile columns copied into the generation payload
+BUSINESS_PROFILE_GENERATION_FIELDS = (
+    'id', 'business_id', 'business_name', 'website_url', 'instagram_handle',
+    'logo_url', 'primary_color', 'secondary_color', 'accent_color', 'font_family',
+    'brand_mission', 'brand_values', 'business_basic_details',
+    'business_services', 'business_additional_details'
+)
+
+
+def _business_profile_generation_dict(business_profile) -> Dict[str, Any]:
+    """Convert a BusinessProfile to the dictionary format expected by AI generation"""
+    return {
+        'id': str(business_profile.id),
+        'business_id': str(business_profile.business_id),
+        'company_name': business_profile.business_name,
+        'business_name': business_profile.business_name,
+        'website_url': business_profile.website_url,
+        'instagram_handle': business_profile.instagram_handle,
+        'logo_url': business_profile.logo_url,
+        'primary_color': business_profile.primary_color,
+        'secondary_color': business_profile.secondary_color,
+        'accent_color': business_profile.accent_color,
+        'font_family': business_profile.font_family,
+        'brand_mission': business_profile.brand_mission,
+        'brand_values': business_profile.brand_values,
+        'business_basic_details': business_profile.business_basic_details,
+        'business_services': business_profile.business_services,
+        'business_additional_details': business_profile.business_additional_details,
+    }
+
+
 def get_business_profile_by_business_id(business_id: str) -> Optional[Dict[str, Any]]:
     """
     Get business profile data by business_id for business users.
@@ -91,41 +181,99 @@ def get_business_profile_by_business_id(business_id: str) -> Optional[Dict[str,
     Returns:
         Dictionary with business profile data or None if not found
     """
+    cache_key = business_profile_cache_key(business_id)
+    profile_data = cache.get(cache_key)
+    if profile_data is not None:
+        return profile_data
+    
     try:
-        from .business_models import BusinessProfile
-        
-        # Get the BusinessProfile for this business_id
-        business_profile = BusinessProfile.objects.get(business_id=business_id)
+        business_profile = BusinessProfile.objects.only(
+            *BUSINESS_PROFILE_GENERATION_FIELDS
+        ).get(business_id=business_id)
+        profile_data = _business_profile_generation_dict(business_profile)
         
-        # Convert to dictionary format expected by AI generation
-        profile_data = {
-            'id': str(business_profile.id),
-            'business_id': str(business_profile.business_id),
-            'company_name': business_profile.business_name,
-            'business_name': business_profile.business_name,
-            'website_url': business_profile.website_url,
-            'instagram_handle': business_profile.instagram_handle,
-            'logo_url': business_profile.logo_url,
-            'primary_color': business_profile.primary_color,
-            'secondary_color': business_profile.secondary_color,
-            'accent_color': business_profile.accent_color,
-            'font_family': business_profile.font_family,
-            'brand_mission': business_profile.brand_mission,
-            'brand_values': business_profile.brand_values,
-            'business_basic_details': business_profile.business_basic_details,
-            'business_services': business_profile.business_services,
-            'business_additional_details': business_profile.business_additional_details,
-        }
-        
-        logger.info(f"[Business Profile] Retrieved profile for business {business_id}: {profile_data['company_name']}, font: {profile_data['font_family']}")
+        logger.info("[Business Profile] Retrieved profile for business %s: %s, font: %s", business_id, profile_data['company_name'], profile_data['font_family'])
+        cache.set(cache_key, profile_data, BUSINESS_PROFILE_CACHE_TIMEOUT)
         return profile_data
         
+    except (BusinessProfile.DoesNotExist, ValidationError):
+        # Unknown or malformed business_id; an expected outcome, no traceback
+        logger.info("[Business Profile] No profile for business %s", business_id)
+        return None
     except Exception as e:
-        logger.error(f"[Business Profile] Failed to get profile for business {business_id}: {str(e)}")
+        logger.error("[Business Profile] Failed to get profile for business %s: %s", business_id, e, exc_info=True)
         return None
 
 
-def create_mock_business_profile(provided_data: Dict[str, Any]):
+def get_business_profiles_by_business_ids(business_ids) -> Dict[str, Dict[str, Any]]:
+    """
+    Get business profile data for several business users at once.
+    
+    Reads all cached profiles in one cache round trip and loads the rest
+    with a single query.
+    
+    Args:
+        business_ids: Iterable of business UUIDs
+    
+    Returns:
+        Dictionary mapping business_id string to profile data; businesses
+        without a profile are omitted
+    """
+    keys = {business_profile_cache_key(business_id): str(business_id) for business_id in business_ids}
+    if not keys:
+        return {}
+    
+    profiles = {keys[key]: data for key, data in cache.get_many(keys).items()}
+    missing = [business_id for business_id in keys.values() if business_id not in profiles]
+    if not missing:
+        return profiles
+    
+    try:
+        loaded = {}
+        for business_profile in BusinessProfile.objects.only(
+            *BUSINESS_PROFILE_GENERATION_FIELDS
+        ).filter(business_id__in=missing):
+            loaded[str(business_profile.business_id)] = _business_profile_generation_dict(business_profile)
+    except Exception as e:
+        logger.error("[Business Profile] Failed to get profiles for %d businesses: %s", len(missing), e, exc_info=True)
+        return profiles
+    
+    cache.set_many(
+        {business_profile_cache_key(business_id): data for business_id, data in loaded.items()},
+        BUSINESS_PROFILE_CACHE_TIMEOUT
+    )
+    profiles.update(loaded)
+    return profiles
+
+
+# Leading MockBusinessProfile fields copied verbatim from the provided data,
+# in declaration order
+MOCK_PROFILE_TEXT_FIELDS = (
+    'company_name', 'industry', 'brand_voice', 'target_audience',
+    'primary_color', 'secondary_color', 'logo_url',
+)
+
+
+@dataclass(slots=True)
+class MockBusinessProfile:
+    """Stand-in for BusinessBrand built from request-provided profile data"""
+    company_name: str = ''
+    industry: str = ''
+    brand_voice: str = ''
+    target_audience: str = ''
+    primary_color: str = ''
+    secondary_color: str = ''
+    logo_url: str = ''
+    font_family: str = ''
+    # business_description is used by LayoutGeneratorService
+    business_description: str = ''
+    design_components: Dict[str, Any] = field(default_factory=dict)
+    
+    def __post_init__(self):
+        self.font_family = self.font_family or 'Roboto'  # Default fallback
+
+
+def create_mock_business_profile(provided_data: Dict[str, Any]) -> MockBusinessProfile:
     """
     Create a mock business profile object from provided data.
     
@@ -135,33 +283,31 @@ def create_mock_business_profile(provided_data: Dict[str, Any]):
     Returns:
         MockBusinessProfile instance
     """
-    class MockBusinessProfile:
-        def __init__(self, data):
-            self.company_name = data.get('company_name', '')
-            self.industry = data.get('industry', '')
-            self.brand_voice = data.get('brand_voice', '')
-            self.target_audience = data.get('target_audience', '')
-            self.primary_color = data.get('primary_color', '')
-            self.secondary_color = data.get('secondary_color', '')
-            # Get font_family, with fallback to brandGuidelines.fontFamily
-            font_family = data.get('font_family', '')
-            if not font_family and isinstance(data.get('brandGuidelines'), dict):
-                font_family = data.get('brandGuidelines', {}).get('fontFamily', '')
-            
-            self.font_family = font_family or 'Roboto'  # Default fallback
-            
-            # Log font family for debugging
-            logger.info(f"[Business Profile] Font family set to: {self.font_family} (from font_family: {data.get('font_family')}, brandGuidelines: {data.get('brandGuidelines', {}).get('fontFamily', 'N/A') if isinstance(data.get('brandGuidelines'), dict) else 'N/A'})")
-            self.logo_url = data.get('logo_url', '')
-            # business_description is used by LayoutGeneratorService
-            # Use brand_voice or industry as fallback if not provided
-            self.business_description = data.get('business_description', 
-                data.get('brand_voice', f"{data.get('company_name', '')} - {data.get('industry', '')}"))
-            
-            # Add design components support
-            self.design_components = data.get('designComponents', {})
+    data = provided_data
+    brand_guidelines = data.get('brandGuidelines')
+    
+    # Get font_family, with fallback to brandGuidelines.fontFamily
+    font_family = data.get('font_family', '')
+    if not font_family and isinstance(brand_guidelines, dict):
+        font_family = brand_guidelines.get('fontFamily', '')
+    
+    profile = MockBusinessProfile(
+        **{name: data.get(name) or '' for name in MOCK_PROFILE_TEXT_FIELDS},
+        font_family=font_family,
+        # Use brand_voice or industry as fallback if not provided
+        business_description=data.get('business_description',
+            data.get('brand_voice', f"{data.get('company_name', '')} - {data.get('industry', '')}")),
+        # Add design components support
+        design_components=data.get('designComponents', {}),
+    )
     
-    return MockBusinessProfile(provided_data)
+    # Log font family for debugging
+    logger.info(
+        "[Business Profile] Font family set to: %s (from font_family: %s, brandGuidelines: %s)",
+        profile.font_family, data.get('font_family'),
+        brand_guidelines.get('fontFamily', 'N/A') if isinstance(brand_guidelines, dict) else 'N/A'
+    )
+    return profile
 
 
 def get_business_profile_for_generation(user, provided_business_profile: Optional[Dict[str, Any]] = None):
@@ -183,7 +329,7 @@ def get_business_profile_for_generation(user, provided_business_profile: Optiona
     # Use provided business profile first if available (PRIORITY: mock profile over DB)
     if provided_business_profile:
         business_profile = create_mock_business_profile(provided_business_profile)
-        logger.info(f"[Business Profile] Using provided mock business profile: {business_profile.company_name}, font: {business_profile.font_family}")
+        logger.info("[Business Profile] Using provided mock business profile: %s, font: %s", business_profile.company_name, business_profile.font_family)
     
     # Get user's business brand for database record (required by foreign key)
     # If using mock profile, we still need a DB profile for the foreign key, but we'll use mock for generation
@@ -192,60 +338,81 @@ def get_business_profile_for_generation(user, provided_business_profile: Optiona
     except BusinessBrand.DoesNotExist:
         # If no DB profile exists but we have a mock profile, create a minimal one for the foreign key
         if business_profile:
-            logger.warning(f"[Business Profile] No DB profile found, but using mock profile. Creating minimal DB profile for foreign key.")
-            # Create a minimal business brand for the foreign key requirement
-            db_business_profile = BusinessBrand.objects.create(
-                user=user,
-                company_name=business_profile.company_name or "Temporary",
-                font_family=business_profile.font_family or "Roboto",
-                primary_color=business_profile.primary_color or "#3b82f6",
-                secondary_color=business_profile.secondary_color or "#10b981"
-            )
+            logger.warning("[Business Profile] No DB profile found, but using mock profile. Creating minimal DB profile for foreign key.")
+            # Create a minimal business brand for the foreign key requirement;
+            # get_or_create keeps concurrent requests from racing on the insert
+            with transaction.atomic():
+                db_business_profile, _ = BusinessBrand.objects.get_or_create(
+                    user=user,
+                    defaults={
+                        'company_name': business_profile.company_name or "Temporary",
+                        'font_family': business_profile.font_family or "Roboto",
+                        'primary_color': business_profile.primary_color or "#3b82f6",
+                        'secondary_color': business_profile.secondary_color or "#10b981",
+                    }
+                )
         else:
             raise ValueError("Business profile not found. Please create a business profile first.")
     
     # If no provided profile, use user's business brand for generation too
     if not business_profile:
         business_profile = db_business_profile
-        logger.info(f"[Business Profile] Using database business profile: {business_profile.company_name}, font: {business_profile.font_family}")
+        logger.info("[Business Profile] Using database business profile: %s, font: %s", business_profile.company_name, business_profile.font_family)
     
     return business_profile, db_business_profile
 
 
-def upload_and_manage_logo(company_logo, user_id: int, old_logo_url: Optional[str] = None) -> Optional[str]:
+def stage_uploaded_file(uploaded_file, subdir: str) -> str:
     """
-    Upload company logo and manage old logo deletion.
+    Write an uploaded file under MEDIA_ROOT so a Celery worker can process it.
+    
+    The worker opens the returned local path, so it must run with the same
+    MEDIA_ROOT mounted as the web process.
     
     Args:
-        company_logo: File object to upload
-        user_id: User ID for file organization
-        old_logo_url: URL of old logo to delete (optional)
+        uploaded_file: Django UploadedFile object
+        subdir: Directory under MEDIA_ROOT/uploads to stage the file in
     
     Returns:
-        New logo URL or None if upload failed
+        Absolute path of the staged file (keeps the original extension)
     """
-    if not company_logo:
-        return None
+    staging_dir = os.path.join(settings.MEDIA_ROOT, 'uploads', subdir)
+    os.makedirs(staging_dir, exist_ok=True)
+    
+    _, extension = os.path.splitext(uploaded_file.name)
+    staged_path = os.path.join(staging_dir, f"{uuid.uuid4()}{extension.lower()}")
+    with open(staged_path, 'wb') as destination:
+        for chunk in uploaded_file.chunks():
+            destination.write(chunk)
     
+    return staged_path
+
+
+def queue_staged_file_task(task, staged_path: str, *args) -> bool:
+    """
+    Queue a Celery task that consumes a staged file.
+    
+    If the broker is unreachable the staged file is deleted, since no worker
+    will ever pick it up.
+    
+    Args:
+        task: Celery task taking *args
+        staged_path: Path returned by stage_uploaded_file
+        *args: Arguments for the task
+    
+    Returns:
+        True if the task was queued, False otherwise
+    """
     try:
-        from services.s3_service import s3_service
-        
-        logo_url = s3_service.upload_business_logo(company_logo, user_id)
-        if not logo_url:
-            return None
-        
-        # Delete old logo if provided and different from new one
-        if old_logo_url and old_logo_url != logo_url:
-            try:
-                s3_service.delete_file(old_logo_url)
-            except Exception as e:
-                logger.warning(f"Failed to delete old logo {old_logo_url}: {str(e)}")
-        
-        return logo_url
-        
+        task.delay(*args)
+        return True
     except Exception as e:
-        logger.error(f"Exception during logo upload for user {user_id}: {str(e)}", exc_info=True)
-        return None
+        logger.error("Failed to queue %s for staged file %s: %s", task.name, staged_path, e, exc_info=True)
+        try:
+            os.remove(staged_path)
+        except OSError as remove_error:
+            logger.warning("Failed to remove staged file %s: %s", staged_path, remove_error)
+        return False
 
 
 def refresh_logo_signed_url(user) -> Tuple[bool, Optional[str], Optional[str]]:
@@ -267,8 +434,6 @@ def refresh_logo_signed_url(user) -> Tuple[bool, Optional[str], Optional[str]]:
         return False, None, "No logo found"
     
     try:
-        from services.s3_service import s3_service
-        
         s3_key = s3_service._extract_key_from_url(business_brand.logo_url)
         if not s3_key:
             return False, None, "Invalid logo URL"
@@ -278,12 +443,12 @@ def refresh_logo_signed_url(user) -> Tuple[bool, Optional[str], Optional[str]]:
             return False, None, "Failed to refresh logo URL"
         
         business_brand.logo_url = new_signed_url
-        business_brand.save()
+        business_brand.save(update_fields=['logo_url', 'updated_at'])
         
         return True, new_signed_url, None
         
     except Exception as e:
-        logger.error(f"Error refreshing logo URL for user {user.id}: {str(e)}", exc_info=True)
+        logger.error("Error refreshing logo URL for user %s: %s", user.id, e, exc_info=True)
         return False, None, str(e)
 
 
@@ -319,28 +484,24 @@ def create_social_media_post_record(user, conversation, business_profile, user_i
     )
 
 
-def generate_caption_and_hashtags(user_input: str, business_profile) -> Tuple[str, str]:
-    """
-    Generate caption and hashtags using OpenAI.
-    
-    Args:
-        user_input: User's request
-        business_profile: Business profile object (real or mock)
-    
-    Returns:
-        Tuple of (caption, hashtags)
-    """
-    try:
-        import openai
-        
-        caption_prompt = f"""
+# Pooled HTTP settings shared by the caption generation OpenAI clients
+OPENAI_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+# Matches a "Caption:" or "Hashtags:" header at the start of a line, including
+# markdown-bold variants such as "**Caption:**"; sections may come in either order
+CAPTION_SECTION_RE = re.compile(
+    r'^[ \t]*\**(?P<section>Caption|Hashtags)\**:\**[ \t]*',
+    re.MULTILINE
+)
+CAPTION_SYSTEM_PROMPT = "You are an expert social media content creator. Create engaging Instagram captions and hashtags that match the brand voice and target audience."
+# Filled with str.format_map; braces inside user values are not re-parsed
+CAPTION_PROMPT_TEMPLATE = """
 Based on the user request "{user_input}" and the business context, create an engaging Instagram caption.
 
 Business Context:
-- Company: {business_profile.company_name}
-- Industry: {business_profile.industry}
-- Brand Voice: {business_profile.brand_voice}
-- Target Audience: {business_profile.target_audience}
+- Company: {company_name}
+- Industry: {industry}
+- Brand Voice: {brand_voice}
+- Target Audience: {target_audience}
 
 Please provide:
 1. An engaging caption (2-3 sentences, matches brand voice) - DO NOT include hashtags in the caption text
@@ -352,51 +513,111 @@ Format your response as:
 Caption: [Your caption here - no hashtags]
 Hashtags: [Your hashtags here]
 """
-        
-        # Create OpenAI client for caption generation
-        client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        
-        caption_response = client.chat.completions.create(
+
+
+@lru_cache(maxsize=1)
+def _get_openai_client() -> openai.OpenAI:
+    """Process-wide OpenAI client so caption calls reuse pooled connections"""
+    return openai.OpenAI(
+        api_key=os.getenv('OPENAI_API_KEY'),
+        http_client=httpx.Client(limits=OPENAI_HTTP_LIMITS)
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_async_openai_client() -> openai.AsyncOpenAI:
+    """Process-wide AsyncOpenAI client for the async caption variant"""
+    return openai.AsyncOpenAI(
+        api_key=os.getenv('OPENAI_API_KEY'),
+        http_client=httpx.AsyncClient(limits=OPENAI_HTTP_LIMITS)
+    )
+
+
+def _build_caption_messages(user_input: str, business_profile) -> list:
+    """Build the chat messages for caption and hashtag generation"""
+    caption_prompt = CAPTION_PROMPT_TEMPLATE.format_map({
+        'user_input': user_input,
+        'company_name': business_profile.company_name,
+        'industry': business_profile.industry,
+        'brand_voice': business_profile.brand_voice,
+        'target_audience': business_profile.target_audience,
+    })
+    return [
+        {"role": "system", "content": CAPTION_SYSTEM_PROMPT},
+        {"role": "user", "content": caption_prompt}
+    ]
+
+
+def _parse_caption_response(caption_content: str, user_input: str) -> Tuple[str, str]:
+    """Split a "Caption: ... Hashtags: ..." completion into its two parts"""
+    headers = list(CAPTION_SECTION_RE.finditer(caption_content))
+    sections = {}
+    for header, next_header in zip(headers, headers[1:] + [None]):
+        end = next_header.start() if next_header else len(caption_content)
+        # Sections may wrap over several lines; join them with single spaces
+        sections[header.group('section')] = ' '.join(caption_content[header.end():end].split())
+    caption = sections.get('Caption', '')
+    hashtags = sections.get('Hashtags', '')
+    
+    # Fallbacks if parsing failed
+    caption = caption or f"Check out our latest update! {user_input}"
+    hashtags = hashtags or "#business #update #socialmedia"
+    
+    return caption, hashtags
+
+
+def generate_caption_and_hashtags(user_input: str, business_profile) -> Tuple[str, str]:
+    """
+    Generate caption and hashtags using OpenAI.
+    
+    Args:
+        user_input: User's request
+        business_profile: Business profile object (real or mock)
+    
+    Returns:
+        Tuple of (caption, hashtags)
+    """
+    try:
+        caption_response = _get_openai_client().chat.completions.create(
             model="gpt-4o-mini",  # Using cheaper model for caption generation
-            messages=[
-                {"role": "system", "content": "You are an expert social media content creator. Create engaging Instagram captions and hashtags that match the brand voice and target audience."},
-                {"role": "user", "content": caption_prompt}
-            ],
+            messages=_build_caption_messages(user_input, business_profile),
             max_tokens=300,
             temperature=0.7,
         )
         
         caption_content = caption_response.choices[0].message.content.strip()
+        return _parse_caption_response(caption_content, user_input)
         
-        # Parse caption and hashtags
-        lines = caption_content.split('\n')
-        caption = ''
-        hashtags = ''
-        
-        current_section = None
-        for line in lines:
-            line = line.strip()
-            if line.startswith('Caption:'):
-                current_section = 'caption'
-                caption = line.replace('Caption:', '').strip()
-            elif line.startswith('Hashtags:'):
-                current_section = 'hashtags'
-                hashtags = line.replace('Hashtags:', '').strip()
-            elif current_section and line:
-                if current_section == 'caption':
-                    caption += ' ' + line
-                elif current_section == 'hashtags':
-                    hashtags += ' ' + line
-        
-        # Fallbacks if parsing failed
-        caption = caption or f"Check out our latest update! {user_input}"
-        hashtags = hashtags or "#business #update #socialmedia"
+    except Exception as e:
+        logger.error("Error generating caption and hashtags: %s", e)
+        # Return fallback values
+        return f"Check out our latest update! {user_input}", "#business #update #socialmedia"
+
+
+async def generate_caption_and_hashtags_async(user_input: str, business_profile) -> Tuple[str, str]:
+    """
+    Async variant of generate_caption_and_hashtags.
+    
+    Lets async callers run caption generation concurrently with other AI
+    calls (e.g. via asyncio.gather). business_profile must already be
+    loaded, since its attributes are read without touching the database.
+    
+    Returns:
+        Tuple of (caption, hashtags)
+    """
+    try:
+        caption_response = await _get_async_openai_client().chat.completions.create(
+            model="gpt-4o-mini",
+            messages=_build_caption_messages(user_input, business_profile),
+            max_tokens=300,
+            temperature=0.7,
+        )
         
-        return caption, hashtags
+        caption_content = caption_response.choices[0].message.content.strip()
+        return _parse_caption_response(caption_content, user_input)
         
     except Exception as e:
-        logger.error(f"Error generating caption and hashtags: {str(e)}")
-        # Return fallback values
+        logger.error("Error generating caption and hashtags: %s", e)
         return f"Check out our latest update! {user_input}", "#business #update #socialmedia"
 
 
@@ -414,15 +635,31 @@ def get_conversation_if_exists(conversation_id: Optional[str], user):
     if not conversation_id:
         return None
     
-    try:
-        from knowledge_base.models import Conversation
-        return Conversation.objects.get(id=conversation_id, user=user)
-    except Conversation.DoesNotExist:
-        return None
+    # Callers only attach the conversation as a foreign key
+    return Conversation.objects.filter(
+        id=conversation_id, user=user
+    ).only('id', 'user_id').first()
 
 
 # Instagram Helper Functions
 
+@lru_cache(maxsize=256)
+def _decrypt_instagram_token(encrypted_token: str) -> str:
+    """
+    Decrypt a stored access token, memoized in process memory only.
+    
+    Keyed by the ciphertext, so a reconnected account's new token is
+    decrypted afresh; plaintext tokens never reach the shared cache.
+    """
+    return token_encryption.decrypt_token(encrypted_token)
+
+
+def instagram_token_validation_cache_key(decrypted_token: str) -> str:
+    """Cache key for a token's validity verdict; the token itself is hashed"""
+    token_hash = hashlib.blake2b(decrypted_token.encode(), digest_size=16).hexdigest()
+    return f"instagram_token_valid:{token_hash}"
+
+
 def initialize_instagram_client(user):
     """
     Initialize Instagram API client for user.
@@ -434,10 +671,6 @@ def initialize_instagram_client(user):
         Tuple of (success, client_or_error_message, connected_account)
     """
     try:
-        from knowledge_base.models import ConnectedAccount
-        from knowledge_base.instagram_utils.instagram_api import InstagramAPIClient
-        from knowledge_base.instagram_utils.encryption import token_encryption
-        
         # Get user's Instagram connected account
         try:
             connected_account = ConnectedAccount.objects.get(
@@ -454,29 +687,43 @@ def initialize_instagram_client(user):
         
         # Decrypt the access token
         try:
-            decrypted_token = token_encryption.decrypt_token(connected_account.access_token)
-            logger.info("Successfully decrypted Instagram access token")
+            decrypted_token = _decrypt_instagram_token(connected_account.access_token)
+            logger.debug("Successfully decrypted Instagram access token")
         except Exception as e:
-            logger.error(f"Failed to decrypt Instagram access token: {str(e)}")
+            logger.error("Failed to decrypt Instagram access token: %s", e)
             return False, "Failed to decrypt Instagram access token. Please reconnect your account.", None
         
         # Initialize Instagram API client with decrypted token
         client = InstagramAPIClient(decrypted_token)
         
-        # Validate token
-        logger.info("🔍 Validating Instagram access token...")
-        if not client.validate_token():
-            logger.warning(f"❌ Instagram token validation failed for user {user.id}")
-            return False, "Instagram access token is invalid. Please reconnect your account.", None
+        # Validate token, unless this exact token passed validation recently
+        validation_key = instagram_token_validation_cache_key(decrypted_token)
+        if not cache.get(validation_key):
+            logger.info("🔍 Validating Instagram access token...")
+            if not client.validate_token():
+                logger.warning("❌ Instagram token validation failed for user %s", user.id)
+                return False, "Instagram access token is invalid. Please reconnect your account.", None
+            
+            logger.info("✅ Instagram access token is valid")
+            cache.set(validation_key, True, INSTAGRAM_TOKEN_VALIDATION_TIMEOUT)
         
-        logger.info("✅ Instagram access token is valid")
         return True, client, connected_account
         
     except Exception as e:
-        logger.error(f"Error initializing Instagram client: {str(e)}", exc_info=True)
+        logger.error("Error initializing Instagram client: %s", e, exc_info=True)
         return False, str(e), None
 
 
+@lru_cache(maxsize=256)
+def media_type_for_extension(file_extension: str) -> Optional[str]:
+    """Map a lowercased file extension to 'image', 'video' or None"""
+    if file_extension in IMAGE_EXTENSIONS:
+        return 'image'
+    elif file_extension in VIDEO_EXTENSIONS:
+        return 'video'
+    return None
+
+
 def determine_media_type(media_file) -> Optional[str]:
     """
     Determine media type from file extension.
@@ -490,12 +737,5 @@ def determine_media_type(media_file) -> Optional[str]:
     if not media_file or not hasattr(media_file, 'name'):
         return None
     
-    from services.s3_service import s3_service
-    file_extension = s3_service._get_file_extension(media_file.name).lower()
-    
-    if file_extension in ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg']:
-        return 'image'
-    elif file_extension in ['.mp4', '.mov', '.avi', '.mkv', '.webm']:
-        return 'video'
-    else:
-        return None
+    # _get_file_extension already lowercases the extension
+    return media_type_for_extension(s3_service._get_file_extension(media_file.name))
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-16 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_add_carousel_support'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='socialmediapost',
+            index=models.Index(fields=['user', '-created_at'], name='smp_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='socialmediapost',
+            index=models.Index(fields=['business_id', '-created_at'], name='smp_biz_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='instagrampost',
+            index=models.Index(fields=['user', '-created_at'], name='igp_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contentcalendar',
+            index=models.Index(fields=['user', 'business_profile_id', '-year', '-month'], name='cc_user_profile_period_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contentcalendar',
+            index=models.Index(fields=['business_id', 'business_profile_id', '-year', '-month'], name='cc_biz_profile_period_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contentidea',
+            index=models.Index(fields=['content_calendar', 'scheduled_date', 'scheduled_time'], name='ci_calendar_schedule_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-16 12:00
+
+import api.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_add_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='contentcalendar',
+            name='id',
+            field=models.UUIDField(default=api.models.time_ordered_uuid, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='contentidea',
+            name='id',
+            field=models.UUIDField(default=api.models.time_ordered_uuid, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -2,11 +2,26 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
+from django.utils.functional import cached_property
+import os
+import time
 import uuid
 
 # Import business models
 from .business_models import Business, BusinessProfile
 
+
+def time_ordered_uuid():
+    """
+    Generate a UUIDv7: a 48-bit Unix millisecond timestamp followed by
+    random bits, so new primary keys land at the right edge of the index.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    value &= ~(0xF << 76) & ~(0x3 << 62)
+    value |= 0x7 << 76 | 0x2 << 62
+    return uuid.UUID(int=value)
+
+
 class BusinessBrand(models.Model):
     """
     Model for storing business brand information
@@ -60,7 +75,6 @@ class SocialMediaPost(models.Model):
     post_type = models.CharField(max_length=20, choices=POST_TYPE_CHOICES, default='single', help_text="Type of post (single or carousel)")
     
     # Content
-    post_type = models.CharField(max_length=20, choices=[('single', 'Single Post'), ('carousel', 'Carousel Post')], default='single', help_text="Type of post: single image or carousel")
     image_prompt = models.TextField(help_text="Prompt used to generate the image", blank=True)
     layout_json = models.TextField(blank=True, null=True, help_text="JSON layout for programmatic rendering")
     carousel_layouts = models.JSONField(default=list, help_text="Array of layout JSONs for carousel slides")
@@ -89,6 +103,10 @@ class SocialMediaPost(models.Model):
                 name='api_social_media_post_user_or_business_required'
             )
         ]
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='smp_user_created_idx'),
+            models.Index(fields=['business_id', '-created_at'], name='smp_biz_created_idx'),
+        ]
     
     def __str__(self):
         if self.user:
@@ -122,6 +140,10 @@ class InstagramPost(models.Model):
     class Meta:
         db_table = 'api_instagram_post'
         ordering = ['-created_at']
+        indexes = [
+            # Serves InstagramService.get_user_posts
+            models.Index(fields=['user', '-created_at'], name='igp_user_created_idx'),
+        ]
 
     def __str__(self):
         return f"Instagram Post {self.id} - {self.user.username} ({self.status})"
@@ -130,7 +152,7 @@ class InstagramPost(models.Model):
 class ContentCalendar(models.Model):
     """Content calendar for organizing social media posts"""
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=time_ordered_uuid, editable=False)
     
     # Support both admin users (Django User) and business users (Business model)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='content_calendars', null=True, blank=True)
@@ -163,6 +185,11 @@ class ContentCalendar(models.Model):
                 name='content_calendar_user_or_business_required'
             )
         ]
+        indexes = [
+            # Calendar list/regenerate lookups filter by owner and profile
+            models.Index(fields=['user', 'business_profile_id', '-year', '-month'], name='cc_user_profile_period_idx'),
+            models.Index(fields=['business_id', 'business_profile_id', '-year', '-month'], name='cc_biz_profile_period_idx'),
+        ]
     
     def __str__(self):
         if self.user:
@@ -170,10 +197,10 @@ class ContentCalendar(models.Model):
         else:
             return f"{self.title} - {self.business_profile_id} (Business: {self.business_id})"
     
-    @property
+    @cached_property
     def owner_identifier(self):
         """Get a unique identifier for the calendar owner"""
-        return f"user_{self.user.id}" if self.user else f"business_{self.business_id}"
+        return f"user_{self.user_id}" if self.user_id else f"business_{self.business_id}"
 
 
 class ContentIdea(models.Model):
@@ -193,7 +220,7 @@ class ContentIdea(models.Model):
         ('published', 'Published'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=time_ordered_uuid, editable=False)
     content_calendar = models.ForeignKey(ContentCalendar, on_delete=models.CASCADE, related_name='content_ideas')
     
     # Content details
@@ -238,18 +265,36 @@ class ContentIdea(models.Model):
     class Meta:
         db_table = 'api_content_idea'
         ordering = ['scheduled_date', 'scheduled_time', 'created_at']
+        indexes = [
+            models.Index(fields=['content_calendar', 'scheduled_date', 'scheduled_time'], name='ci_calendar_schedule_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.scheduled_date} ({self.status})"
     
     def mark_scheduled(self):
         """Mark this content idea as scheduled"""
+        # Write only the changed columns, then mirror them on the instance
+        now = timezone.now()
+        ContentIdea.objects.filter(pk=self.pk).update(status='scheduled', updated_at=now)
         self.status = 'scheduled'
-        self.save()
+        self.updated_at = now
     
     def mark_published(self, post_id):
         """Mark this content idea as published"""
+        now = timezone.now()
+        ContentIdea.objects.filter(pk=self.pk).update(
+            status='published', published_post_id=post_id, published_at=now, updated_at=now
+        )
         self.status = 'published'
         self.published_post_id = post_id
-        self.published_at = timezone.now()
-        self.save()
+        self.published_at = now
+        self.updated_at = now
+    
+    @classmethod
+    def bulk_mark_published(cls, ids, post_id=''):
+        """Mark several content ideas as published in a single UPDATE"""
+        now = timezone.now()
+        return cls.objects.filter(pk__in=ids).update(
+            status='published', published_post_id=post_id, published_at=now, updated_at=now
+        )
@@ -1,13 +1,14 @@
 """
 Refactored business profile management views with improved modularity
 """
-import json
 import logging
+import orjson
 from coreliaOS.decorators import login_required
+from django.utils.cache import get_conditional_response
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
-from .helpers import create_json_response, handle_exception
+from .helpers import create_json_response, handle_exception, get_business_profile_for_user
 from .services import BusinessProfileService, SocialMediaPostService, InstagramService
 
 logger = logging.getLogger(__name__)
@@ -18,7 +19,23 @@ logger = logging.getLogger(__name__)
 @require_http_methods(["GET"])
 def get_company_profile_api(request):
     """Get user's business profile with fresh signed URLs"""
-    return BusinessProfileService.get_profile_with_fresh_urls(request.user)
+    etag = BusinessProfileService.profile_etag(
+        get_business_profile_for_user(request.user, allow_none=True)
+    )
+    if etag:
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            if not_modified.status_code == 304:
+                # RFC 9110 requires the 304 to repeat the validator and caching headers
+                not_modified['ETag'] = etag
+                not_modified['Cache-Control'] = 'private, max-age=60'
+            return not_modified
+    
+    response = BusinessProfileService.get_profile_with_fresh_urls(request.user)
+    if etag and response.status_code == 200:
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, max-age=60'
+    return response
 
 
 @login_required
@@ -80,35 +97,39 @@ def create_instagram_post_api(request):
 def generate_social_media_post_api(request):
     """Generate a complete social media post with image and caption"""
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
         
         user_input = data.get('user_input', '')
         conversation_id = data.get('conversation_id')
         provided_business_profile = data.get('business_profile')
         
-        logger.info(f"📥 [API] Received generate post request - User: {request.user.id}, Input: {user_input[:100] if user_input else 'None'}...")
-        if provided_business_profile:
-            logger.info(f"📥 [API] Provided business profile: company={provided_business_profile.get('company_name')}, font_family={provided_business_profile.get('font_family')}, brandGuidelines.fontFamily={provided_business_profile.get('brandGuidelines', {}).get('fontFamily') if isinstance(provided_business_profile.get('brandGuidelines'), dict) else 'N/A'}")
-        else:
-            logger.info(f"📥 [API] No business profile provided, will use database profile")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("📥 [API] Received generate post request - User: %s, Input: %s...", request.user.id, user_input[:100] if user_input else 'None')
+            if provided_business_profile:
+                brand_guidelines = provided_business_profile.get('brandGuidelines')
+                logger.info(
+                    "📥 [API] Provided business profile: company=%s, font_family=%s, brandGuidelines.fontFamily=%s",
+                    provided_business_profile.get('company_name'), provided_business_profile.get('font_family'),
+                    brand_guidelines.get('fontFamily') if isinstance(brand_guidelines, dict) else 'N/A'
+                )
+            else:
+                logger.info("📥 [API] No business profile provided, will use database profile")
         
         response = SocialMediaPostService.generate_post(
             request.user, user_input, conversation_id, provided_business_profile
         )
         
-        # Log response status
-        if hasattr(response, 'content'):
-            try:
-                response_data = json.loads(response.content)
-                logger.info(f"📤 [API] Response status: {response_data.get('status')}, Has data: {bool(response_data.get('data'))}")
-                if response_data.get('data'):
-                    logger.info(f"📤 [API] Post ID: {response_data.get('data', {}).get('id')}, Has layout_json: {bool(response_data.get('data', {}).get('layout_json'))}")
-            except:
-                pass
+        # Log response status from the payload the response was built from
+        response_data = getattr(response, 'data', None)
+        if isinstance(response_data, dict) and logger.isEnabledFor(logging.INFO):
+            post_data = response_data.get('data')
+            logger.info("📤 [API] Response status: %s, Has data: %s", response_data.get('status'), bool(post_data))
+            if post_data:
+                logger.debug("📤 [API] Post ID: %s, Has layout_json: %s", post_data.get('id'), bool(post_data.get('layout_json')))
         
         return response
         
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         logger.error("❌ [API] Invalid JSON in request body")
         return create_json_response(
             "Invalid JSON in request body",
@@ -126,14 +147,14 @@ def generate_social_media_post_api(request):
 def refine_social_media_post_api(request):
     """Refine an existing social media post"""
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
         
         post_id = data.get('post_id')
         refinements = data.get('refinements', {})
         
         return SocialMediaPostService.refine_post(request.user, post_id, refinements)
         
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         return create_json_response(
             "Invalid JSON in request body",
             status='error',
@@ -149,33 +170,31 @@ def refine_social_media_post_api(request):
 def publish_social_media_post_api(request):
     """Publish a social media post to Instagram"""
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
         
         post_id = data.get('post_id')
         connected_account_id = data.get('connected_account_id')
         publish_immediately = data.get('publish_immediately', True)
         
-        logger.info(f"📥 [PUBLISH API] Received publish request - User: {request.user.id}")
-        logger.info(f"📥 [PUBLISH API] Post ID: {post_id}, Account ID: {connected_account_id}")
+        logger.info("📥 [PUBLISH API] Received publish request - User: %s", request.user.id)
+        logger.info("📥 [PUBLISH API] Post ID: %s, Account ID: %s", post_id, connected_account_id)
         
         response = InstagramService.publish_social_media_post(
             request.user, post_id, connected_account_id, publish_immediately
         )
         
-        # Log response
-        if hasattr(response, 'content'):
-            try:
-                response_data = json.loads(response.content)
-                logger.info(f"📤 [PUBLISH API] Response status: {response_data.get('status')}")
-                if response_data.get('data'):
-                    logger.info(f"📤 [PUBLISH API] Post status: {response_data.get('data', {}).get('status')}")
-                    logger.info(f"📤 [PUBLISH API] Instagram post ID: {response_data.get('data', {}).get('instagram_post_id')}")
-            except:
-                pass
+        # Log response from the payload the response was built from
+        response_data = getattr(response, 'data', None)
+        if isinstance(response_data, dict) and logger.isEnabledFor(logging.INFO):
+            post_data = response_data.get('data')
+            logger.info("📤 [PUBLISH API] Response status: %s", response_data.get('status'))
+            if post_data:
+                logger.debug("📤 [PUBLISH API] Post status: %s", post_data.get('status'))
+                logger.debug("📤 [PUBLISH API] Instagram post ID: %s", post_data.get('instagram_post_id'))
         
         return response
         
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         logger.error("❌ [PUBLISH API] Invalid JSON in request body")
         return create_json_response(
             "Invalid JSON in request body",
@@ -228,20 +247,20 @@ def get_instagram_posts_api(request):
     
     if business_id and user_type == 'business':
         # For now, return empty list for business users since we don't have Instagram posts for them yet
-        return JsonResponse({
-            'status': 'success',
-            'message': 'Instagram posts retrieved successfully',
-            'data': []
-        })
+        return create_json_response(
+            "Instagram posts retrieved successfully",
+            data=[]
+        )
     
     # Check for admin user
     if request.user.is_authenticated:
         return InstagramService.get_user_posts(request.user)
     
-    return JsonResponse({
-        'status': 'error',
-        'message': 'Not authenticated'
-    }, status=401)
+    return create_json_response(
+        "Not authenticated",
+        status='error',
+        status_code=401
+    )
 
 
 @csrf_exempt
@@ -255,20 +274,22 @@ def post_to_instagram_api(request):
         
         if business_id and user_type == 'business':
             # For now, return not implemented for business users
-            return JsonResponse({
-                'status': 'error',
-                'message': 'Instagram posting not yet implemented for business users'
-            }, status=501)
+            return create_json_response(
+                "Instagram posting not yet implemented for business users",
+                status='error',
+                status_code=501
+            )
         
         # Check for admin user
         if not request.user.is_authenticated:
-            return JsonResponse({
-                'status': 'error',
-                'message': 'Not authenticated'
-            }, status=401)
+            return create_json_response(
+                "Not authenticated",
+                status='error',
+                status_code=401
+            )
         # Handle both JSON and form data
         if request.content_type == 'application/json':
-            data = json.loads(request.body)
+            data = orjson.loads(request.body)
             post_id = data.get('post_id')
         else:
             post_id = request.POST.get('post_id')
@@ -279,7 +300,7 @@ def post_to_instagram_api(request):
         
         return InstagramService.publish_post(request.user, post_id)
         
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         return create_json_response(
             "Invalid JSON in request body",
             status='error',
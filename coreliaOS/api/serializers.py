@@ -1,13 +1,45 @@
 """
 Serializers for API data transformation
 """
+import logging
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import Dict, Optional
 from django.contrib.auth.models import User
+from django.db.models import QuerySet
+
+from .helpers import get_business_profile_by_business_id, get_business_profiles_by_business_ids
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class BusinessProfileLookup:
+    """Serialized business profile blocks shared across one batch of posts"""
+    # business_id string -> block, or None when the business has no profile
+    by_business_id: Dict[str, Optional[dict]] = field(default_factory=dict)
+    # BusinessBrand id -> block, filled as admin users' posts are serialized
+    by_brand_id: Dict[int, dict] = field(default_factory=dict)
+
+
+def _iso(value):
+    """ISO 8601 string for a date, time or datetime, or None when unset"""
+    return value.isoformat() if value is not None else None
+
 
 class BusinessBrandSerializer:
     """
     Serializer for BusinessBrand model
     """
     
+    # Attributes copied verbatim; read together by one attrgetter call
+    _FIELDS = (
+        'id', 'company_name', 'logo_url', 'primary_color', 'secondary_color',
+        'font_family', 'brand_voice', 'industry', 'target_audience',
+        'business_description',
+    )
+    _get_fields = attrgetter(*_FIELDS)
+    
     @staticmethod
     def to_dict(business_brand):
         """
@@ -19,20 +51,10 @@ class BusinessBrandSerializer:
         Returns:
             dict: Serialized business brand data
         """
-        return {
-            'id': business_brand.id,
-            'company_name': business_brand.company_name,
-            'logo_url': business_brand.logo_url,
-            'primary_color': business_brand.primary_color,
-            'secondary_color': business_brand.secondary_color,
-            'font_family': business_brand.font_family,
-            'brand_voice': business_brand.brand_voice,
-            'industry': business_brand.industry,
-            'target_audience': business_brand.target_audience,
-            'business_description': business_brand.business_description,
-            'created_at': business_brand.created_at.isoformat() if business_brand.created_at else None,
-            'updated_at': business_brand.updated_at.isoformat() if business_brand.updated_at else None,
-        }
+        data = dict(zip(BusinessBrandSerializer._FIELDS, BusinessBrandSerializer._get_fields(business_brand)))
+        data['created_at'] = _iso(business_brand.created_at)
+        data['updated_at'] = _iso(business_brand.updated_at)
+        return data
 
 
 class ContentCalendarSerializer:
@@ -40,6 +62,13 @@ class ContentCalendarSerializer:
     Serializer for ContentCalendar model
     """
     
+    # Attributes copied verbatim; read together by one attrgetter call
+    _FIELDS = (
+        'business_profile_id', 'title', 'month', 'year',
+        'business_profile_data', 'generation_prompt',
+    )
+    _get_fields = attrgetter(*_FIELDS)
+    
     @staticmethod
     def to_dict(content_calendar):
         """
@@ -51,20 +80,28 @@ class ContentCalendarSerializer:
         Returns:
             dict: Serialized content calendar data
         """
-        return {
-            'id': str(content_calendar.id),
-            'user': str(content_calendar.user.id) if content_calendar.user else None,
-            'business_id': str(content_calendar.business_id) if content_calendar.business_id else None,
-            'owner_type': 'admin' if content_calendar.user else 'business',
-            'business_profile_id': content_calendar.business_profile_id,
-            'title': content_calendar.title,
-            'month': content_calendar.month,
-            'year': content_calendar.year,
-            'business_profile_data': content_calendar.business_profile_data,
-            'generation_prompt': content_calendar.generation_prompt,
-            'created_at': content_calendar.created_at.isoformat() if content_calendar.created_at else None,
-            'updated_at': content_calendar.updated_at.isoformat() if content_calendar.updated_at else None,
-        }
+        data = dict(zip(ContentCalendarSerializer._FIELDS, ContentCalendarSerializer._get_fields(content_calendar)))
+        data['id'] = str(content_calendar.id)
+        data['user'] = str(content_calendar.user_id) if content_calendar.user_id else None
+        data['business_id'] = str(content_calendar.business_id) if content_calendar.business_id else None
+        data['owner_type'] = 'admin' if content_calendar.user_id else 'business'
+        data['created_at'] = _iso(content_calendar.created_at)
+        data['updated_at'] = _iso(content_calendar.updated_at)
+        return data
+    
+    @staticmethod
+    def serialize_many(content_calendars):
+        """
+        Convert ContentCalendar instances to dictionaries
+        
+        Args:
+            content_calendars: ContentCalendar queryset or iterable
+        
+        Returns:
+            list: Serialized content calendar data
+        """
+        to_dict = ContentCalendarSerializer.to_dict
+        return [to_dict(content_calendar) for content_calendar in content_calendars]
 
 
 class ContentIdeaSerializer:
@@ -72,38 +109,79 @@ class ContentIdeaSerializer:
     Serializer for ContentIdea model
     """
     
+    # Attributes copied verbatim; read together by one attrgetter call
+    _FIELDS = (
+        'title', 'description', 'content_type',
+        'post_format',  # 'single' or 'carousel'
+        'generation_prompt', 'status', 'published_post_id',
+        'selected_template', 'user_notes', 'media_urls',
+    )
+    _get_fields = attrgetter(*_FIELDS)
+    
     @staticmethod
-    def to_dict(content_idea):
+    def prefetch_queryset(queryset):
+        """
+        Join the relations to_dict reads so serializing a list of ideas
+        costs no per-row queries
+        
+        Args:
+            queryset: ContentIdea queryset
+        
+        Returns:
+            QuerySet: The queryset with the generated post relations joined
+        """
+        return queryset.select_related('generated_post__business_profile')
+    
+    @staticmethod
+    def to_dict(content_idea, business_profiles=None):
         """
         Convert ContentIdea instance to dictionary
         
         Args:
             content_idea: ContentIdea instance
+            business_profiles: Optional BusinessProfileLookup from
+                SocialMediaPostSerializer.prefetch_business_profiles
         
         Returns:
             dict: Serialized content idea data
         """
-        return {
-            'id': str(content_idea.id),
-            'content_calendar': str(content_idea.content_calendar.id),
-            'title': content_idea.title,
-            'description': content_idea.description,
-            'content_type': content_idea.content_type,
-            'post_format': content_idea.post_format,  # 'single' or 'carousel'
-            'generation_prompt': content_idea.generation_prompt,
-            'scheduled_date': content_idea.scheduled_date.isoformat() if content_idea.scheduled_date else None,
-            'scheduled_time': content_idea.scheduled_time.isoformat() if content_idea.scheduled_time else None,
-            'status': content_idea.status,
-            'generated_post_data': SocialMediaPostSerializer.to_dict(content_idea.generated_post) if content_idea.generated_post else None,
-            'published_post_id': content_idea.published_post_id,
-            'selected_template': content_idea.selected_template,
-            'user_notes': content_idea.user_notes,
-            'media_urls': content_idea.media_urls,
-            'created_at': content_idea.created_at.isoformat() if content_idea.created_at else None,
-            'updated_at': content_idea.updated_at.isoformat() if content_idea.updated_at else None,
-            'approved_at': content_idea.approved_at.isoformat() if content_idea.approved_at else None,
-            'published_at': content_idea.published_at.isoformat() if content_idea.published_at else None,
-        }
+        data = dict(zip(ContentIdeaSerializer._FIELDS, ContentIdeaSerializer._get_fields(content_idea)))
+        data['id'] = str(content_idea.id)
+        data['content_calendar'] = str(content_idea.content_calendar_id)
+        data['scheduled_date'] = _iso(content_idea.scheduled_date)
+        data['scheduled_time'] = _iso(content_idea.scheduled_time)
+        data['generated_post_data'] = SocialMediaPostSerializer.to_dict(content_idea.generated_post, business_profiles) if content_idea.generated_post_id else None
+        data['created_at'] = _iso(content_idea.created_at)
+        data['updated_at'] = _iso(content_idea.updated_at)
+        data['approved_at'] = _iso(content_idea.approved_at)
+        data['published_at'] = _iso(content_idea.published_at)
+        return data
+    
+    @staticmethod
+    def serialize_many(content_ideas, business_profiles=None):
+        """
+        Convert ContentIdea instances to dictionaries, loading their
+        generated posts' relations and business profiles in batches
+        
+        Args:
+            content_ideas: ContentIdea queryset or iterable
+            business_profiles: Optional BusinessProfileLookup from
+                SocialMediaPostSerializer.prefetch_business_profiles, to share
+                one lookup across several calls
+        
+        Returns:
+            list: Serialized content idea data
+        """
+        if isinstance(content_ideas, QuerySet):
+            content_ideas = ContentIdeaSerializer.prefetch_queryset(content_ideas)
+        content_ideas = list(content_ideas)
+        if business_profiles is None:
+            business_profiles = SocialMediaPostSerializer.prefetch_business_profiles(
+                content_idea.generated_post for content_idea in content_ideas
+                if content_idea.generated_post_id
+            )
+        to_dict = ContentIdeaSerializer.to_dict
+        return [to_dict(content_idea, business_profiles) for content_idea in content_ideas]
 
 
 class SocialMediaPostSerializer:
@@ -111,79 +189,160 @@ class SocialMediaPostSerializer:
     Serializer for SocialMediaPost model
     """
     
+    # Attributes copied verbatim; read together by one attrgetter call
+    _FIELDS = (
+        'post_type',  # 'single' or 'carousel'
+        'image_prompt', 'layout_json', 'generated_image_url', 'caption',
+        'hashtags', 'status', 'user_input', 'instagram_post_id',
+    )
+    _get_fields = attrgetter(*_FIELDS)
+    
+    @staticmethod
+    def _brand_profile_data(business_brand):
+        """Build the post's business profile block from an admin user's BusinessBrand"""
+        return {
+            'company_name': business_brand.company_name,
+            'industry': business_brand.industry,
+            'brand_voice': business_brand.brand_voice,
+            'primary_color': business_brand.primary_color,
+            'secondary_color': business_brand.secondary_color,
+            'font_family': business_brand.font_family,
+            'logo_url': business_brand.logo_url,
+        }
+    
     @staticmethod
-    def _get_business_profile_data(social_media_post):
+    def _business_profile_data(business_profile_data):
+        """Build the post's business profile block from a business user's profile data"""
+        return {
+            'company_name': business_profile_data.get('company_name'),
+            'industry': business_profile_data.get('industry', ''),
+            'brand_voice': business_profile_data.get('brand_mission', ''),  # Use brand_mission as brand_voice
+            'primary_color': business_profile_data.get('primary_color'),
+            'secondary_color': business_profile_data.get('secondary_color'),
+            'font_family': business_profile_data.get('font_family'),
+            'logo_url': business_profile_data.get('logo_url'),
+        }
+    
+    @staticmethod
+    def prefetch_business_profiles(posts):
+        """
+        Load the BusinessProfile data of every business-user post at once
+        
+        The returned lookup also memoizes the profile blocks built for admin
+        users' BusinessBrands, so posts sharing a brand share one block.
+        
+        Args:
+            posts: Iterable of SocialMediaPost instances
+        
+        Returns:
+            BusinessProfileLookup: Serialized profile blocks, for to_dict
+        """
+        business_ids = {
+            str(post.business_id) for post in posts
+            if post.business_id and not post.business_profile_id
+        }
+        profiles = get_business_profiles_by_business_ids(business_ids)
+        return BusinessProfileLookup(by_business_id={
+            business_id: (
+                SocialMediaPostSerializer._business_profile_data(profiles[business_id])
+                if business_id in profiles else None
+            )
+            for business_id in business_ids
+        })
+    
+    @staticmethod
+    def _get_business_profile_data(social_media_post, business_profiles=None):
         """
         Get business profile data for both admin and business users.
         
         Args:
             social_media_post: SocialMediaPost instance
+            business_profiles: Optional BusinessProfileLookup from
+                prefetch_business_profiles
             
         Returns:
             dict: Business profile data or None
         """
-        if social_media_post.business_profile:
+        if social_media_post.business_profile_id:
             # Admin user: has BusinessBrand profile
-            return {
-                'company_name': social_media_post.business_profile.company_name,
-                'industry': social_media_post.business_profile.industry,
-                'brand_voice': social_media_post.business_profile.brand_voice,
-                'primary_color': social_media_post.business_profile.primary_color,
-                'secondary_color': social_media_post.business_profile.secondary_color,
-                'font_family': social_media_post.business_profile.font_family,
-                'logo_url': social_media_post.business_profile.logo_url,
-            }
+            if business_profiles is None:
+                return SocialMediaPostSerializer._brand_profile_data(social_media_post.business_profile)
+            by_brand_id = business_profiles.by_brand_id
+            profile_data = by_brand_id.get(social_media_post.business_profile_id)
+            if profile_data is None:
+                profile_data = SocialMediaPostSerializer._brand_profile_data(social_media_post.business_profile)
+                by_brand_id[social_media_post.business_profile_id] = profile_data
+            return profile_data
         elif social_media_post.business_id:
-            # Business user: get BusinessProfile by business_id
+            # Business user: get BusinessProfile by business_id; a business
+            # the batch found no profile for is None, not re-queried
+            if business_profiles is not None:
+                business_id = str(social_media_post.business_id)
+                if business_id in business_profiles.by_business_id:
+                    return business_profiles.by_business_id[business_id]
             try:
-                from .helpers import get_business_profile_by_business_id
                 business_profile_data = get_business_profile_by_business_id(social_media_post.business_id)
                 if business_profile_data:
-                    return {
-                        'company_name': business_profile_data.get('company_name'),
-                        'industry': business_profile_data.get('industry', ''),
-                        'brand_voice': business_profile_data.get('brand_mission', ''),  # Use brand_mission as brand_voice
-                        'primary_color': business_profile_data.get('primary_color'),
-                        'secondary_color': business_profile_data.get('secondary_color'),
-                        'font_family': business_profile_data.get('font_family'),
-                        'logo_url': business_profile_data.get('logo_url'),
-                    }
+                    return SocialMediaPostSerializer._business_profile_data(business_profile_data)
             except Exception as e:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"Failed to get business profile for business_id {social_media_post.business_id}: {str(e)}")
+                logger.warning("Failed to get business profile for business_id %s: %s", social_media_post.business_id, e)
         
         return None
     
     @staticmethod
-    def to_dict(social_media_post):
+    def prefetch_queryset(queryset):
+        """
+        Join the BusinessBrand that to_dict reads for admin users' posts
+        
+        Args:
+            queryset: SocialMediaPost queryset
+        
+        Returns:
+            QuerySet: The queryset with business_profile joined
+        """
+        return queryset.select_related('business_profile')
+    
+    @staticmethod
+    def serialize_many(posts):
+        """
+        Convert SocialMediaPost instances to dictionaries, looking up the
+        business profiles of business-user posts in one batch
+        
+        Args:
+            posts: SocialMediaPost queryset or iterable
+        
+        Returns:
+            list: Serialized social media post data
+        """
+        if isinstance(posts, QuerySet):
+            posts = SocialMediaPostSerializer.prefetch_queryset(posts)
+        posts = list(posts)
+        business_profiles = SocialMediaPostSerializer.prefetch_business_profiles(posts)
+        to_dict = SocialMediaPostSerializer.to_dict
+        return [to_dict(post, business_profiles) for post in posts]
+    
+    @staticmethod
+    def to_dict(social_media_post, business_profiles=None):
         """
         Convert SocialMediaPost instance to dictionary
         
         Args:
             social_media_post: SocialMediaPost instance
+            business_profiles: Optional BusinessProfileLookup from
+                prefetch_business_profiles
         
         Returns:
             dict: Serialized social media post data
         """
-        return {
-            'id': str(social_media_post.id),
-            'post_type': social_media_post.post_type,  # 'single' or 'carousel'
-            'image_prompt': social_media_post.image_prompt,
-            'layout_json': social_media_post.layout_json,
-            'carousel_layouts': social_media_post.carousel_layouts if social_media_post.carousel_layouts else [],  # Array of carousel slide layouts
-            'generated_image_url': social_media_post.generated_image_url,
-            'caption': social_media_post.caption,
-            'hashtags': social_media_post.hashtags,
-            'status': social_media_post.status,
-            'user_input': social_media_post.user_input,
-            'instagram_post_id': social_media_post.instagram_post_id,
-            'connected_account_id': str(social_media_post.connected_account.id) if social_media_post.connected_account else None,
-            'business_profile': SocialMediaPostSerializer._get_business_profile_data(social_media_post),
-            'business_id': str(social_media_post.business_id) if social_media_post.business_id else None,
-            'created_at': social_media_post.created_at.isoformat(),
-            'updated_at': social_media_post.updated_at.isoformat(),
-        }
+        data = dict(zip(SocialMediaPostSerializer._FIELDS, SocialMediaPostSerializer._get_fields(social_media_post)))
+        data['id'] = str(social_media_post.id)
+        data['carousel_layouts'] = social_media_post.carousel_layouts or []  # Array of carousel slide layouts
+        data['connected_account_id'] = str(social_media_post.connected_account_id) if social_media_post.connected_account_id else None
+        data['business_profile'] = SocialMediaPostSerializer._get_business_profile_data(social_media_post, business_profiles)
+        data['business_id'] = str(social_media_post.business_id) if social_media_post.business_id else None
+        data['created_at'] = _iso(social_media_post.created_at)
+        data['updated_at'] = _iso(social_media_post.updated_at)
+        return data
 
 
 class InstagramPostSerializer:
@@ -191,6 +350,12 @@ class InstagramPostSerializer:
     Serializer for InstagramPost model
     """
     
+    # Attributes copied verbatim; read together by one attrgetter call
+    _FIELDS = (
+        'id', 'caption', 'media_url', 'media_type', 'status', 'instagram_post_id',
+    )
+    _get_fields = attrgetter(*_FIELDS)
+    
     @staticmethod
     def to_dict(instagram_post):
         """
@@ -202,15 +367,9 @@ class InstagramPostSerializer:
         Returns:
             dict: Serialized Instagram post data
         """
-        return {
-            'id': instagram_post.id,
-            'caption': instagram_post.caption,
-            'media_url': instagram_post.media_url,
-            'media_type': instagram_post.media_type,
-            'status': instagram_post.status,
-            'instagram_post_id': instagram_post.instagram_post_id,
-            'scheduled_at': instagram_post.scheduled_at.isoformat() if instagram_post.scheduled_at else None,
-            'posted_at': instagram_post.posted_at.isoformat() if instagram_post.posted_at else None,
-            'created_at': instagram_post.created_at.isoformat() if instagram_post.created_at else None,
-            'updated_at': instagram_post.updated_at.isoformat() if instagram_post.updated_at else None,
-        }
+        data = dict(zip(InstagramPostSerializer._FIELDS, InstagramPostSerializer._get_fields(instagram_post)))
+        data['scheduled_at'] = _iso(instagram_post.scheduled_at)
+        data['posted_at'] = _iso(instagram_post.posted_at)
+        data['created_at'] = _iso(instagram_post.created_at)
+        data['updated_at'] = _iso(instagram_post.updated_at)
+        return data
@@ -3,21 +3,27 @@ Service classes for handling complex business logic
 """
 import json
 import logging
+from datetime import timedelta
 from typing import Dict, Any, Optional, Tuple
 from django.utils import timezone
 
+from services.s3_service import s3_service
 from .models import BusinessBrand, InstagramPost, SocialMediaPost
 from .serializers import BusinessBrandSerializer, InstagramPostSerializer, SocialMediaPostSerializer
 from .helpers import (
     create_json_response, handle_exception, get_business_profile_for_user,
-    get_business_profile_for_generation, upload_and_manage_logo,
+    get_business_profile_for_generation, stage_uploaded_file, queue_staged_file_task,
     refresh_logo_signed_url, create_social_media_post_record,
     generate_caption_and_hashtags, get_conversation_if_exists,
     initialize_instagram_client, determine_media_type
 )
+from .tasks import upload_brand_logo
 
 logger = logging.getLogger(__name__)
 
+# Age after which a stored logo signed URL is re-signed on read
+LOGO_URL_REFRESH_AGE = timedelta(hours=1)
+
 
 class BusinessProfileService:
     """Service for managing business profiles"""
@@ -43,9 +49,8 @@ class BusinessProfileService:
             
             # Generate fresh signed URL if logo exists and is old
             if business_brand.logo_url:
-                from datetime import datetime, timedelta
                 should_refresh = (
-                    business_brand.updated_at < datetime.now(business_brand.updated_at.tzinfo) - timedelta(hours=1)
+                    business_brand.updated_at < timezone.now() - LOGO_URL_REFRESH_AGE
                     if business_brand.updated_at else True
                 )
                 
@@ -62,6 +67,28 @@ class BusinessProfileService:
         except Exception as e:
             return handle_exception(e, "Failed to retrieve business profile")
     
+    @staticmethod
+    def profile_etag(business_brand) -> Optional[str]:
+        """
+        Weak ETag for the profile payload, or None when it must be rebuilt.
+        
+        No ETag is issued once the logo URL is due for re-signing, so a
+        client never revalidates a copy holding a stale signed URL.
+        
+        Args:
+            business_brand: BusinessBrand instance or None
+        
+        Returns:
+            ETag string or None
+        """
+        if not business_brand or not business_brand.updated_at:
+            return None
+        if business_brand.logo_url and business_brand.updated_at < timezone.now() - LOGO_URL_REFRESH_AGE:
+            return None
+        # Microsecond resolution, so two saves within the same second differ
+        updated_at = business_brand.updated_at
+        return f'W/"brand-{business_brand.user_id}-{int(updated_at.timestamp())}{updated_at.microsecond:06d}"'
+    
     @staticmethod
     def create_or_update_profile(user, profile_data: Dict[str, Any], company_logo=None):
         """
@@ -85,8 +112,8 @@ class BusinessProfileService:
                 )
             
             # Handle logo upload
-            logo_url = None
             old_logo_url = None
+            staged_logo_path = None
             
             # Get existing profile to check for old logo
             existing_brand = get_business_profile_for_user(user, allow_none=True)
@@ -94,13 +121,14 @@ class BusinessProfileService:
                 old_logo_url = existing_brand.logo_url
             
             if company_logo:
-                logo_url = upload_and_manage_logo(company_logo, user.id, old_logo_url)
-                if not logo_url:
+                # Stage the file locally; the S3 upload runs in a Celery task
+                if not s3_service.is_available() or not s3_service.is_valid_image(company_logo.name):
                     return create_json_response(
                         "Failed to upload logo. Please try again.",
                         status='error',
                         status_code=400
                     )
+                staged_logo_path = stage_uploaded_file(company_logo, 'brand_logos')
             
             # Create or update business brand
             defaults = {
@@ -114,13 +142,14 @@ class BusinessProfileService:
                 'business_description': profile_data.get('business_description', ''),
             }
             
-            if logo_url:
-                defaults['logo_url'] = logo_url
-            
-            business_brand, created = BusinessBrand.objects.get_or_create(
-                user=user,
-                defaults=defaults
-            )
+            # Reuse the brand loaded above instead of selecting it again
+            if existing_brand:
+                business_brand, created = existing_brand, False
+            else:
+                business_brand, created = BusinessBrand.objects.get_or_create(
+                    user=user,
+                    defaults=defaults
+                )
             
             if not created:
                 # Update existing profile
@@ -128,7 +157,16 @@ class BusinessProfileService:
                     setattr(business_brand, key, value)
                 business_brand.save()
             
+            # The current logo_url is served until the worker swaps in the new one
+            logo_upload_pending = bool(staged_logo_path) and queue_staged_file_task(
+                upload_brand_logo, staged_logo_path,
+                business_brand.id, user.id, staged_logo_path, old_logo_url
+            )
+            
             response_data = BusinessBrandSerializer.to_dict(business_brand)
+            response_data['logo_upload_pending'] = logo_upload_pending
+            if staged_logo_path and not logo_upload_pending:
+                response_data['logo_error'] = 'Logo upload could not be started. Please try again.'
             
             return create_json_response(
                 "Business profile saved successfully",
@@ -316,7 +354,10 @@ class SocialMediaPostService:
                 )
             
             try:
-                social_media_post = SocialMediaPost.objects.get(id=post_id, user=user)
+                # The serializer reads both relations; join them up front
+                social_media_post = SocialMediaPost.objects.select_related(
+                    'business_profile', 'connected_account'
+                ).get(id=post_id, user=user)
             except SocialMediaPost.DoesNotExist:
                 return create_json_response(
                     "Social media post not found",
@@ -535,8 +576,13 @@ class InstagramService:
             JsonResponse with posts list or error
         """
         try:
-            posts = InstagramPost.objects.filter(user=user).order_by('-created_at')
-            posts_data = [InstagramPostSerializer.to_dict(post) for post in posts]
+            # Only the columns InstagramPostSerializer reads
+            posts = InstagramPost.objects.filter(user=user).only(
+                'id', 'caption', 'media_url', 'media_type', 'status', 'instagram_post_id',
+                'scheduled_at', 'posted_at', 'created_at', 'updated_at'
+            ).order_by('-created_at')
+            # Serialized once, so stream rows instead of caching instances
+            posts_data = [InstagramPostSerializer.to_dict(post) for post in posts.iterator(chunk_size=500)]
             
             return create_json_response(
                 "Instagram posts retrieved successfully",
@@ -571,7 +617,10 @@ class InstagramService:
                 )
             
             try:
-                social_media_post = SocialMediaPost.objects.get(id=post_id, user=user)
+                # connected_account is replaced below, so only the brand is joined
+                social_media_post = SocialMediaPost.objects.select_related(
+                    'business_profile'
+                ).get(id=post_id, user=user)
             except SocialMediaPost.DoesNotExist:
                 return create_json_response(
                     "Social media post not found",
@@ -0,0 +1,18 @@
+# api/signals.py
+
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+import logging
+
+from .business_models import BusinessProfile
+from .helpers import business_profile_cache_key
+
+logger = logging.getLogger(__name__)
+
+
+@receiver([post_save, post_delete], sender=BusinessProfile, dispatch_uid="invalidate_business_profile_cache")
+def invalidate_business_profile_cache(sender, instance, **kwargs):
+    """Drop the cached generation profile when a business profile changes"""
+    cache.delete(business_profile_cache_key(instance.business_id))
+    logger.debug("Invalidated cached business profile for business %s", instance.business_id)
@@ -0,0 +1,74 @@
+"""
+Celery tasks for the API app
+"""
+import logging
+import os
+from celery import shared_task
+from django.core.cache import cache
+from django.core.files import File
+from django.utils import timezone
+
+from services.s3_service import s3_service
+from .business_models import BusinessProfile
+from .models import BusinessBrand
+from .helpers import business_profile_cache_key
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def upload_business_logo(profile_id: str, business_id: str, staged_path: str):
+    """Upload a staged business logo to S3 and store its URL on the profile"""
+    try:
+        with open(staged_path, 'rb') as staged_file:
+            logo_url = s3_service.upload_business_logo(
+                File(staged_file, name=os.path.basename(staged_path)), business_id
+            )
+
+        if not logo_url:
+            logger.error("Logo upload failed for business profile %s", profile_id)
+            return {'status': 'error', 'message': 'Failed to upload logo'}
+
+        # Bump updated_at so clients polling the profile see the new logo;
+        # update() skips post_save, so drop the generation cache here
+        BusinessProfile.objects.filter(pk=profile_id).update(
+            logo_url=logo_url, updated_at=timezone.now()
+        )
+        cache.delete(business_profile_cache_key(business_id))
+        logger.info("Logo uploaded for business profile %s", profile_id)
+        return {'status': 'success', 'logo_url': logo_url}
+
+    finally:
+        try:
+            os.remove(staged_path)
+        except OSError as e:
+            logger.warning("Failed to remove staged logo %s: %s", staged_path, e)
+
+
+@shared_task
+def upload_brand_logo(brand_id: int, user_id: int, staged_path: str, old_logo_url: str = None):
+    """Upload a staged BusinessBrand logo to S3 and swap it in for the old one"""
+    try:
+        with open(staged_path, 'rb') as staged_file:
+            logo_url = s3_service.upload_business_logo(
+                File(staged_file, name=os.path.basename(staged_path)), user_id
+            )
+
+        if not logo_url:
+            logger.error("Logo upload failed for business brand %s", brand_id)
+            return {'status': 'error', 'message': 'Failed to upload logo'}
+
+        BusinessBrand.objects.filter(pk=brand_id).update(
+            logo_url=logo_url, updated_at=timezone.now()
+        )
+        if old_logo_url and old_logo_url != logo_url:
+            s3_service.delete_file(old_logo_url)
+        logger.info("Logo uploaded for business brand %s", brand_id)
+        return {'status': 'success', 'logo_url': logo_url}
+
+    finally:
+        try:
+            os.remove(staged_path)
+        except OSError as e:
+            logger.warning("Failed to remove staged logo %s: %s", staged_path, e)
+
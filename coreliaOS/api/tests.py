@@ -1,2 +1,143 @@
-from django.test import TestCase
+from datetime import date
+from unittest.mock import patch
 
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from .business_models import Business, BusinessProfile
+from .helpers import _parse_caption_response, create_json_response
+from .models import BusinessBrand, ContentCalendar, ContentIdea, SocialMediaPost
+
+
+class ParseCaptionResponseTests(SimpleTestCase):
+    def test_caption_then_hashtags(self):
+        caption, hashtags = _parse_caption_response(
+            "Caption: Fresh bread\ndaily.\nHashtags: #bakery #fresh", 'bread'
+        )
+        self.assertEqual(caption, 'Fresh bread daily.')
+        self.assertEqual(hashtags, '#bakery #fresh')
+
+    def test_hashtags_before_caption(self):
+        caption, hashtags = _parse_caption_response(
+            "Hashtags: #bakery #fresh\nCaption: Fresh bread daily.", 'bread'
+        )
+        self.assertEqual(caption, 'Fresh bread daily.')
+        self.assertEqual(hashtags, '#bakery #fresh')
+
+    def test_markdown_bold_headers(self):
+        caption, hashtags = _parse_caption_response(
+            "**Caption:** Fresh bread daily.\n\n**Hashtags:** #bakery #fresh", 'bread'
+        )
+        self.assertEqual(caption, 'Fresh bread daily.')
+        self.assertEqual(hashtags, '#bakery #fresh')
+
+    def test_missing_sections_fall_back_to_defaults(self):
+        caption, hashtags = _parse_caption_response("Nothing useful here", 'bread')
+        self.assertEqual(caption, 'Check out our latest update! bread')
+        self.assertEqual(hashtags, '#business #update #socialmedia')
+
+
+class BusinessSessionMixin:
+    """Logs the test client in as a business user through the session"""
+
+    def login_business(self, business):
+        session = self.client.session
+        session['business_id'] = str(business.id)
+        session['user_type'] = 'business'
+        session.save()
+
+
+class BusinessProfileApiQueryTests(BusinessSessionMixin, TestCase):
+    def setUp(self):
+        self.business = Business.objects.create(
+            first_name='Ada', last_name='Baker', email='ada@example.com'
+        )
+        BusinessProfile.objects.create(business=self.business, business_name='Ada Bakes')
+        self.login_business(self.business)
+
+    def test_profile_loads_business_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('api:business:business_profile'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['business']['email'], 'ada@example.com')
+        self.assertEqual(response.data['profile']['business_name'], 'Ada Bakes')
+
+
+class ContentCalendarListQueryTests(BusinessSessionMixin, TestCase):
+    def setUp(self):
+        # Business profiles are cached; start each test from a cold cache
+        cache.clear()
+        self.business = Business.objects.create(
+            first_name='Ada', last_name='Baker', email='ada@example.com'
+        )
+        BusinessProfile.objects.create(business=self.business, business_name='Ada Bakes')
+        for month in (1, 2, 3):
+            calendar = ContentCalendar.objects.create(
+                business_id=self.business.id, business_profile_id='profile-1',
+                title=f'Month {month}', month=month, year=2025, generation_prompt='plan'
+            )
+            for day in (1, 2):
+                post = SocialMediaPost.objects.create(
+                    business_id=self.business.id, caption='Caption', hashtags='#tag',
+                    user_input='prompt', status='ready'
+                )
+                ContentIdea.objects.create(
+                    content_calendar=calendar, title=f'Idea {day}', description='Idea',
+                    content_type='promo', generation_prompt='prompt',
+                    scheduled_date=date(2025, month, day), generated_post=post
+                )
+        self.login_business(self.business)
+
+    def test_query_count_does_not_grow_with_calendars_and_ideas(self):
+        # Calendars, their ideas with posts, and one batch of business profiles
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                reverse('api:get_content_calendars'), {'business_profile_id': 'profile-1'}
+            )
+        self.assertEqual(response.status_code, 200)
+        calendars = response.data['data']['calendars']
+        self.assertEqual([calendar['month'] for calendar in calendars], [3, 2, 1])
+        self.assertTrue(all(len(calendar['content_ideas']) == 2 for calendar in calendars))
+        self.assertEqual(
+            calendars[0]['content_ideas'][0]['generated_post_data']['business_profile']['company_name'],
+            'Ada Bakes'
+        )
+
+
+class GeneratePostForContentIdeaQueryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('ada', 'ada@example.com', 'pw')
+        self.brand = BusinessBrand.objects.create(user=self.user, company_name='Ada Bakes')
+        calendar = ContentCalendar.objects.create(
+            user=self.user, business_profile_id='profile-1', title='January',
+            month=1, year=2025, generation_prompt='plan'
+        )
+        self.idea = ContentIdea.objects.create(
+            content_calendar=calendar, title='Idea', description='Idea', content_type='promo',
+            generation_prompt='prompt', scheduled_date=date(2025, 1, 1)
+        )
+        self.post = SocialMediaPost.objects.create(
+            user=self.user, business_profile=self.brand, post_type='carousel',
+            caption='Caption', hashtags='#tag', user_input='prompt', status='ready'
+        )
+        self.client.force_login(self.user)
+
+    def test_links_generated_post_without_extra_queries(self):
+        generated = create_json_response(
+            'Social media post generated successfully',
+            data={'id': self.post.id}, status_code=201
+        )
+        with patch('api.services.SocialMediaPostService.generate_post', return_value=generated):
+            # User, idea, generated post with its brand, idea update
+            with self.assertNumQueries(4):
+                response = self.client.post(
+                    reverse('api:generate_post_for_content_idea', args=[self.idea.id]),
+                    {'business_profile': {'company_name': 'Ada Bakes'}},
+                    content_type='application/json'
+                )
+        self.assertEqual(response.status_code, 201)
+        self.idea.refresh_from_db()
+        self.assertEqual(self.idea.generated_post_id, self.post.id)
+        self.assertEqual(self.idea.post_format, 'carousel')
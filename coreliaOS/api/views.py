@@ -1,4 +1,3 @@
-from django.http import JsonResponse
 from django.contrib.auth import authenticate, login, logout
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
@@ -6,8 +5,10 @@ from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
 from django.db import transaction
+from django.db.models import Prefetch
 from knowledge_base.models import KnowledgeBaseConfig
 from coreliaOS.decorators import login_required
+from .helpers import OrjsonResponse
 import json
 import asyncio
 import os
@@ -18,14 +19,14 @@ from functools import wraps
 def async_require_GET(view_func):
     async def _wrapped_view(request, *args, **kwargs):
         if request.method != "GET":
-            return JsonResponse({"error": "Method not allowed"}, status=405)
+            return OrjsonResponse({"error": "Method not allowed"}, status=405)
         return await view_func(request, *args, **kwargs)
     return _wrapped_view
 
 @require_http_methods(["GET"])
 def public_api(request):
     """Public API endpoint - accessible to everyone"""
-    return JsonResponse({
+    return OrjsonResponse({
         'message': 'This is a public API endpoint',
         'status': 'success',
         'data': {
@@ -37,10 +38,10 @@ def public_api(request):
 @async_require_GET
 async def public_async_api(request):
     if request.method != "GET":
-        return JsonResponse({"error": "Method not allowed"}, status=405)
+        return OrjsonResponse({"error": "Method not allowed"}, status=405)
     """Public Async API endpoint - accessible to everyone"""
     await asyncio.sleep(1)  # Simulate async work
-    return JsonResponse({
+    return OrjsonResponse({
         'message': 'This is a public API endpoint',
         'status': 'success',
         'data': {
@@ -60,7 +61,7 @@ def login_api(request):
         password = data.get('password')
         
         if not username or not password:
-            return JsonResponse({
+            return OrjsonResponse({
                 'error': 'Username and password are required',
                 'status': 'error'
             }, status=400)
@@ -71,7 +72,7 @@ def login_api(request):
             # Force session save to ensure cookies are set
             request.session.save()
             
-            response = JsonResponse({
+            response = OrjsonResponse({
                 'message': 'Login successful',
                 'status': 'success',
                 'user': {
@@ -96,18 +97,18 @@ def login_api(request):
             
             return response
         else:
-            return JsonResponse({
+            return OrjsonResponse({
                 'error': 'Invalid credentials',
                 'status': 'error'
             }, status=401)
     
     except json.JSONDecodeError:
-        return JsonResponse({
+        return OrjsonResponse({
             'error': 'Invalid JSON data',
             'status': 'error'
         }, status=400)
     except Exception as e:
-        return JsonResponse({
+        return OrjsonResponse({
             'error': str(e),
             'status': 'error'
         }, status=500)
@@ -127,7 +128,7 @@ def register_api(request):
         
         # Validation
         if not username or not email or not password:
-            return JsonResponse({
+            return OrjsonResponse({
                 'error': 'Username, email, and password are required',
                 'status': 'error'
             }, status=400)
@@ -136,21 +137,21 @@ def register_api(request):
         try:
             validate_email(email)
         except ValidationError:
-            return JsonResponse({
+            return OrjsonResponse({
                 'error': 'Invalid email format',
                 'status': 'error'
             }, status=400)
         
         # Check if username already exists
         if User.objects.filter(username=username).exists():
-            return JsonResponse({
+            return OrjsonResponse({
                 'error': 'Username already exists',
                 'status': 'error'
             }, status=400)
         
         # Check if email already exists
         if User.objects.filter(email=email).exists():
-            return JsonResponse({
+            return OrjsonResponse({
                 'error': 'Email already registered',
                 'status': 'error'
             }, status=400)
@@ -187,10 +188,11 @@ def register_api(request):
                 # The transaction will be rolled back automatically
                 raise config_error
         
-        # Auto-login after successful registration
-        login(request, user)
+        # Auto-login after successful registration; the user did not come from
+        # authenticate(), so name the backend explicitly
+        login(request, user, backend='api.backends.BusinessBrandModelBackend')
         
-        return JsonResponse({
+        return OrjsonResponse({
             'message': 'User registered successfully',
             'status': 'success',
             'user': {
@@ -204,13 +206,13 @@ def register_api(request):
     
     except json.JSONDecodeError as e:
         logging.error(f"JSON decode error in register_api: {str(e)}\n{traceback.format_exc()}")
-        return JsonResponse({
+        return OrjsonResponse({
             'error': 'Invalid JSON data',
             'status': 'error'
         }, status=400)
     except Exception as e:
         logging.error(f"Exception in register_api: {str(e)}\n{traceback.format_exc()}")
-        return JsonResponse({
+        return OrjsonResponse({
             'error': 'Registration failed. Please try again.',
             'status': 'error'
         }, status=500)
@@ -222,12 +224,12 @@ def logout_api(request):
     """Logout API endpoint"""
     if request.user.is_authenticated:
         logout(request)
-        return JsonResponse({
+        return OrjsonResponse({
             'message': 'Logout successful',
             'status': 'success'
         })
     else:
-        return JsonResponse({
+        return OrjsonResponse({
             'error': 'User not authenticated',
             'status': 'error'
         }, status=401)
@@ -237,7 +239,7 @@ def logout_api(request):
 @require_http_methods(["GET"])
 def protected_api(request):
     """Protected API endpoint - requires authentication"""
-    return JsonResponse({
+    return OrjsonResponse({
         'message': 'This is a protected API endpoint',
         'status': 'success',
         'user': {
@@ -261,7 +263,7 @@ def protected_api(request):
 @require_http_methods(["GET"])
 def user_profile_api(request):
     """Get current user's profile"""
-    return JsonResponse({
+    return OrjsonResponse({
         'message': 'User profile retrieved successfully',
         'status': 'success',
         'user': {
@@ -298,20 +300,20 @@ def update_profile_api(request):
                 validate_email(data['email'])
                 # Check if email already exists for another user
                 if User.objects.filter(email=data['email']).exclude(id=user.id).exists():
-                    return JsonResponse({
+                    return OrjsonResponse({
                         'error': 'Email already registered by another user',
                         'status': 'error'
                     }, status=400)
                 user.email = data['email']
             except ValidationError:
-                return JsonResponse({
+                return OrjsonResponse({
                     'error': 'Invalid email format',
                     'status': 'error'
                 }, status=400)
         
         user.save()
         
-        return JsonResponse({
+        return OrjsonResponse({
             'message': 'Profile updated successfully',
             'status': 'success',
             'user': {
@@ -324,12 +326,12 @@ def update_profile_api(request):
         })
     
     except json.JSONDecodeError:
-        return JsonResponse({
+        return OrjsonResponse({
             'error': 'Invalid JSON data',
             'status': 'error'
         }, status=400)
     except Exception as e:
-        return JsonResponse({
+        return OrjsonResponse({
             'error': str(e),
             'status': 'error'
         }, status=500)
@@ -340,7 +342,7 @@ def update_profile_api(request):
 def admin_only_api(request):
     """Admin-only API endpoint"""
     if not request.user.is_staff:
-        return JsonResponse({
+        return OrjsonResponse({
             'error': 'Admin access required',
             'status': 'error'
         }, status=403)
@@ -362,7 +364,7 @@ def admin_only_api(request):
             'last_login': user.last_login.isoformat() if user.last_login else None,
         })
     
-    return JsonResponse({
+    return OrjsonResponse({
         'message': 'Admin data retrieved successfully',
         'status': 'success',
         'data': {
@@ -376,7 +378,7 @@ def admin_only_api(request):
 def auth_status_api(request):
     """Check authentication status"""
     if request.user.is_authenticated:
-        return JsonResponse({
+        return OrjsonResponse({
             'authenticated': True,
             'status': 'success',
             'user': {
@@ -390,7 +392,7 @@ def auth_status_api(request):
             }
         })
     else:
-        return JsonResponse({
+        return OrjsonResponse({
             'authenticated': False,
             'status': 'success',
             'message': 'User not authenticated'
@@ -536,14 +538,14 @@ def generate_content_calendar(request):
         business_profile_id = data.get('business_profile_id')
         
         if not business_profile:
-            return JsonResponse({
+            return OrjsonResponse({
                 'success': False,
                 'error': 'Business profile data is required'
             }, status=400)
         
         # We always expect a business_profile_id for mock profiles
         if not business_profile_id:
-            return JsonResponse({
+            return OrjsonResponse({
                 'success': False,
                 'error': 'Business profile ID is required'
             }, status=400)
@@ -563,7 +565,7 @@ def generate_content_calendar(request):
             # For business users, use business_id from session
             business_id = request.session.get('business_id')
             if not business_id:
-                return JsonResponse({
+                return OrjsonResponse({
                     'success': False,
                     'error': 'Business authentication invalid'
                 }, status=401)
@@ -735,7 +737,7 @@ Important: Return ONLY the JSON array, no other text or explanation."""
         content_ideas_data = json.loads(response_content)
         
         if not isinstance(content_ideas_data, list) or len(content_ideas_data) != 5:
-            return JsonResponse({
+            return OrjsonResponse({
                 'success': False,
                 'error': 'Invalid response format from LLM'
             }, status=500)
@@ -756,10 +758,10 @@ Important: Return ONLY the JSON array, no other text or explanation."""
         else:
             create_kwargs['user'] = request.user
             
-        content_calendar = ContentCalendar.objects.create(**create_kwargs)
+        content_calendar = ContentCalendar(**create_kwargs)
         
-        # Create content ideas
-        created_ideas = []
+        # Build content ideas; malformed entries from the LLM are skipped
+        content_ideas = []
         for idea_data in content_ideas_data:
             try:
                 scheduled_date_str = idea_data['scheduled_date']
@@ -770,7 +772,7 @@ Important: Return ONLY the JSON array, no other text or explanation."""
                 if idea_data['content_type'] == 'educational' and post_format == 'single':
                     post_format = 'carousel'  # Force educational content to be carousel
                 
-                content_idea = ContentIdea.objects.create(
+                content_idea = ContentIdea(
                     content_calendar=content_calendar,
                     title=idea_data['title'],
                     description=idea_data['description'],
@@ -780,14 +782,30 @@ Important: Return ONLY the JSON array, no other text or explanation."""
                     generation_prompt=idea_data['generation_prompt'],
                     status='pending_approval'
                 )
-                
-                created_ideas.append(model_to_dict(content_idea))
-                logger.info(f"Created content idea: {content_idea.title}")
+                # Reject over-long values and invalid choices here, so one bad
+                # idea is skipped instead of failing the whole bulk insert.
+                # The calendar is not saved yet and media_urls starts empty;
+                # uniqueness needs no per-row query for a fresh UUID key.
+                content_idea.full_clean(
+                    exclude=['content_calendar', 'media_urls'],
+                    validate_unique=False,
+                    validate_constraints=False
+                )
+                content_ideas.append(content_idea)
             except Exception as e:
                 logger.error(f"Error creating content idea: {str(e)}")
                 continue
         
-        return JsonResponse({
+        # Insert the calendar and all of its ideas together, the ideas in a
+        # single multi-row INSERT
+        with transaction.atomic():
+            content_calendar.save(force_insert=True)
+            ContentIdea.objects.bulk_create(content_ideas, batch_size=500)
+        
+        created_ideas = [model_to_dict(content_idea) for content_idea in content_ideas]
+        logger.info(f"Created {len(content_ideas)} content ideas for calendar {content_calendar.id}")
+        
+        return OrjsonResponse({
             'success': True,
             'data': {
                 'calendar': model_to_dict(content_calendar),
@@ -799,7 +817,7 @@ Important: Return ONLY the JSON array, no other text or explanation."""
     except json.JSONDecodeError as e:
         logger = logging.getLogger(__name__)
         logger.error(f"JSON decode error: {str(e)}")
-        return JsonResponse({
+        return OrjsonResponse({
             'success': False,
             'error': 'Invalid JSON in request or response'
         }, status=400)
@@ -808,7 +826,7 @@ Important: Return ONLY the JSON array, no other text or explanation."""
         logger.error(f"Error generating content calendar: {str(e)}")
         import traceback
         logger.error(traceback.format_exc())
-        return JsonResponse({
+        return OrjsonResponse({
             'success': False,
             'error': str(e)
         }, status=500)
@@ -820,13 +838,13 @@ def get_content_calendars(request):
     """Get user's content calendars, optionally filtered by business profile"""
     try:
         from .models import ContentCalendar, ContentIdea
-        from .serializers import ContentCalendarSerializer, ContentIdeaSerializer
+        from .serializers import ContentCalendarSerializer, ContentIdeaSerializer, SocialMediaPostSerializer
         
         # Get business profile filter (required for mock profiles)
         business_profile_id = request.GET.get('business_profile_id')
         
         if not business_profile_id:
-            return JsonResponse({
+            return OrjsonResponse({
                 'success': False,
                 'error': 'Business profile ID is required'
             }, status=400)
@@ -836,7 +854,7 @@ def get_content_calendars(request):
             # For business users, use business_id from session
             business_id = request.session.get('business_id')
             if not business_id:
-                return JsonResponse({
+                return OrjsonResponse({
                     'success': False,
                     'error': 'Business authentication invalid'
                 }, status=401)
@@ -853,17 +871,32 @@ def get_content_calendars(request):
                 'business_profile_id': business_profile_id
             }
         
-        calendars = ContentCalendar.objects.filter(**filter_kwargs).order_by('-year', '-month')
+        # Load every calendar's ideas, and the posts and relations their
+        # serializers read, in a fixed number of queries
+        content_ideas = ContentIdeaSerializer.prefetch_queryset(
+            ContentIdea.objects.order_by('scheduled_date')
+        )
+        calendars = list(ContentCalendar.objects.filter(**filter_kwargs).prefetch_related(
+            Prefetch('content_ideas', queryset=content_ideas)
+        ).order_by('-year', '-month'))
+        
+        # Business profiles of business-user posts, looked up in one batch
+        business_profiles = SocialMediaPostSerializer.prefetch_business_profiles(
+            idea.generated_post
+            for calendar in calendars
+            for idea in calendar.content_ideas.all()
+            if idea.generated_post_id
+        )
         
-        calendars_data = []
-        for calendar in calendars:
-            calendar_dict = ContentCalendarSerializer.to_dict(calendar)
-            # Add content ideas
-            content_ideas = ContentIdea.objects.filter(content_calendar=calendar).order_by('scheduled_date')
-            calendar_dict['content_ideas'] = [ContentIdeaSerializer.to_dict(idea) for idea in content_ideas]
-            calendars_data.append(calendar_dict)
+        calendars_data = ContentCalendarSerializer.serialize_many(calendars)
+        for calendar, calendar_dict in zip(calendars, calendars_data):
+            # Add content ideas; passed as a list so the prefetched rows are
+            # used instead of re-querying with the serializer's joins
+            calendar_dict['content_ideas'] = ContentIdeaSerializer.serialize_many(
+                list(calendar.content_ideas.all()), business_profiles
+            )
         
-        return JsonResponse({
+        return OrjsonResponse({
             'success': True,
             'data': {
                 'calendars': calendars_data
@@ -872,7 +905,7 @@ def get_content_calendars(request):
     except Exception as e:
         logger = logging.getLogger(__name__)
         logger.error(f"Error getting content calendars: {str(e)}")
-        return JsonResponse({
+        return OrjsonResponse({
             'success': False,
             'error': 'Failed to get content calendars'
         }, status=500)
@@ -892,7 +925,7 @@ def approve_content_idea(request, idea_id):
             # For business users, use business_id from session
             business_id = request.session.get('business_id')
             if not business_id:
-                return JsonResponse({
+                return OrjsonResponse({
                     'success': False,
                     'error': 'Business authentication invalid'
                 }, status=401)
@@ -912,7 +945,7 @@ def approve_content_idea(request, idea_id):
         
         content_idea.mark_scheduled()
         
-        return JsonResponse({
+        return OrjsonResponse({
             'success': True,
             'data': model_to_dict(content_idea),
             'message': 'Content idea marked as scheduled successfully'
@@ -920,7 +953,7 @@ def approve_content_idea(request, idea_id):
     except Exception as e:
         logger = logging.getLogger(__name__)
         logger.error(f"Error marking content idea as scheduled: {str(e)}")
-        return JsonResponse({
+        return OrjsonResponse({
             'success': False,
             'error': 'Failed to mark content idea as scheduled'
         }, status=500)
@@ -940,7 +973,7 @@ def unschedule_content_idea(request, idea_id):
             # For business users, use business_id from session
             business_id = request.session.get('business_id')
             if not business_id:
-                return JsonResponse({
+                return OrjsonResponse({
                     'success': False,
                     'error': 'Business authentication invalid'
                 }, status=401)
@@ -963,7 +996,7 @@ def unschedule_content_idea(request, idea_id):
         content_idea.approved_at = None  # Clear the approval timestamp
         content_idea.save()
         
-        return JsonResponse({
+        return OrjsonResponse({
             'success': True,
             'data': model_to_dict(content_idea),
             'message': 'Content idea unscheduled successfully'
@@ -971,7 +1004,7 @@ def unschedule_content_idea(request, idea_id):
     except Exception as e:
         logger = logging.getLogger(__name__)
         logger.error(f"Error unscheduling content idea: {str(e)}")
-        return JsonResponse({
+        return OrjsonResponse({
             'success': False,
             'error': 'Failed to unschedule content idea'
         }, status=500)
@@ -992,7 +1025,7 @@ def update_content_idea(request, idea_id):
             # For business users, use business_id from session
             business_id = request.session.get('business_id')
             if not business_id:
-                return JsonResponse({
+                return OrjsonResponse({
                     'success': False,
                     'error': 'Business authentication invalid'
                 }, status=401)
@@ -1032,20 +1065,20 @@ def update_content_idea(request, idea_id):
         
         content_idea.save()
         
-        return JsonResponse({
+        return OrjsonResponse({
             'success': True,
             'data': model_to_dict(content_idea),
             'message': 'Content idea updated successfully'
         })
     except json.JSONDecodeError:
-        return JsonResponse({
+        return OrjsonResponse({
             'success': False,
             'error': 'Invalid JSON in request body'
         }, status=400)
     except Exception as e:
         logger = logging.getLogger(__name__)
         logger.error(f"Error updating content idea: {str(e)}")
-        return JsonResponse({
+        return OrjsonResponse({
             'success': False,
             'error': 'Failed to update content idea'
         }, status=500)
@@ -1067,7 +1100,7 @@ def delete_content_calendar(request, calendar_id):
             # For business users, use business_id from session
             business_id = request.session.get('business_id')
             if not business_id:
-                return JsonResponse({
+                return OrjsonResponse({
                     'success': False,
                     'error': 'Business authentication invalid'
                 }, status=401)
@@ -1079,7 +1112,7 @@ def delete_content_calendar(request, calendar_id):
                 )
             except ContentCalendar.DoesNotExist:
                 logger.warning(f"Content calendar {calendar_id} not found for business {business_id}")
-                return JsonResponse({
+                return OrjsonResponse({
                     'success': False,
                     'error': 'Content calendar not found'
                 }, status=404)
@@ -1092,7 +1125,7 @@ def delete_content_calendar(request, calendar_id):
                 )
             except ContentCalendar.DoesNotExist:
                 logger.warning(f"Content calendar {calendar_id} not found for user {request.user.username}")
-                return JsonResponse({
+                return OrjsonResponse({
                     'success': False,
                     'error': 'Content calendar not found'
                 }, status=404)
@@ -1100,7 +1133,7 @@ def delete_content_calendar(request, calendar_id):
         calendar_title = content_calendar.title
         content_calendar.delete()  # This will cascade delete all content ideas
         
-        return JsonResponse({
+        return OrjsonResponse({
             'success': True,
             'message': f'Content calendar "{calendar_title}" deleted successfully'
         })
@@ -1109,7 +1142,7 @@ def delete_content_calendar(request, calendar_id):
         logger.error(f"Error deleting content calendar: {str(e)}")
         import traceback
         logger.error(traceback.format_exc())
-        return JsonResponse({
+        return OrjsonResponse({
             'success': False,
             'error': f'Failed to delete content calendar: {str(e)}'
         }, status=500)
@@ -1134,7 +1167,7 @@ def generate_post_for_content_idea(request, idea_id):
             # For business users, use business_id from session
             business_id = request.session.get('business_id')
             if not business_id:
-                return JsonResponse({
+                return OrjsonResponse({
                     'success': False,
                     'error': 'Business authentication invalid'
                 }, status=401)
@@ -1171,7 +1204,7 @@ def generate_post_for_content_idea(request, idea_id):
             
             business_profile_data = get_business_profile_by_business_id(business_id)
             if not business_profile_data:
-                return JsonResponse({
+                return OrjsonResponse({
                     'success': False,
                     'error': f'Business profile not found for business ID: {business_id}'
                 }, status=404)
@@ -1215,9 +1248,9 @@ def generate_post_for_content_idea(request, idea_id):
             )
         
         # Parse the response and convert to content calendar format
-        if hasattr(response, 'content'):
-            import json
-            response_data = json.loads(response.content)
+        # Services build OrjsonResponse, which keeps its payload on .data
+        response_data = getattr(response, 'data', None)
+        if isinstance(response_data, dict):
             
             # Handle both content calendar format (success: boolean) and social media format (status: string)
             is_success = response_data.get('success') or response_data.get('status') == 'success'
@@ -1230,18 +1263,21 @@ def generate_post_for_content_idea(request, idea_id):
                     # Link the generated post to the content idea (both admin and business users)
                     from .models import SocialMediaPost
                     try:
+                        # The full row is needed: model_to_dict(content_idea) below
+                        # serializes the linked post, brand included
+                        posts = SocialMediaPost.objects.select_related('business_profile')
                         # For business users, filter by business_id; for admin users, filter by user
                         if request.session.get('user_type') == 'business':
                             business_id = request.session.get('business_id')
-                            generated_post = SocialMediaPost.objects.get(id=post_id, business_id=business_id)
+                            generated_post = posts.get(id=post_id, business_id=business_id)
                         else:
-                            generated_post = SocialMediaPost.objects.get(id=post_id, user=request.user)
+                            generated_post = posts.get(id=post_id, user=request.user)
                         
                         # Delete old generated_post if it exists (for regeneration)
-                        if content_idea.generated_post:
-                            old_post = content_idea.generated_post
-                            logger.info(f"Deleting old generated post {old_post.id} before linking new post {post_id}")
-                            old_post.delete()
+                        if content_idea.generated_post_id:
+                            old_post_id = content_idea.generated_post_id
+                            logger.info(f"Deleting old generated post {old_post_id} before linking new post {post_id}")
+                            SocialMediaPost.objects.filter(pk=old_post_id).delete()
                         
                         # Link the new generated post to the content idea
                         content_idea.generated_post = generated_post
@@ -1271,13 +1307,13 @@ def generate_post_for_content_idea(request, idea_id):
                         
                     except SocialMediaPost.DoesNotExist:
                         logger.error(f"Generated post {post_id} not found in database")
-                        return JsonResponse({
+                        return OrjsonResponse({
                             'success': False,
                             'error': 'Generated post not found'
                         }, status=404)
                 
                 # Convert social media post response to content calendar format for both user types
-                service_response_data = json.loads(response.content)
+                service_response_data = response_data
                 
                 # Create unified content calendar format response
                 unified_response = {
@@ -1289,10 +1325,10 @@ def generate_post_for_content_idea(request, idea_id):
                     }
                 }
                 
-                return JsonResponse(unified_response, status=response.status_code)
+                return OrjsonResponse(unified_response, status=response.status_code)
         
         # If we get here, something went wrong
-        return JsonResponse({
+        return OrjsonResponse({
             'success': False,
             'error': 'Failed to generate post'
         }, status=500)
@@ -1303,7 +1339,7 @@ def generate_post_for_content_idea(request, idea_id):
         logger.error(f"Error generating post for content idea: {str(e)}")
         import traceback
         logger.error(traceback.format_exc())
-        return JsonResponse({
+        return OrjsonResponse({
             'success': False,
             'error': f'Failed to generate post: {str(e)}'
         }, status=500)
\ No newline at end of file
@@ -96,6 +96,9 @@ if os.getenv("DB_NAME"):
             "PASSWORD": os.getenv("DB_PASSWORD"),
             "HOST": os.getenv("DB_HOST", "db"),
             "PORT": os.getenv("DB_PORT", "5432"),
+            # Reuse connections across requests instead of reconnecting each time
+            "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "600")),
+            "CONN_HEALTH_CHECKS": True,
         }
     }
 else:
@@ -126,6 +129,22 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# BusinessBrandModelBackend handles new logins; ModelBackend stays listed so
+# sessions created under it remain valid until they expire
+AUTHENTICATION_BACKENDS = [
+    "api.backends.BusinessBrandModelBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+
+# Argon2 for new hashes; PBKDF2 stays listed so existing hashes still verify
+# and are upgraded on the next successful login
+PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -150,8 +169,14 @@ STATICFILES_DIRS = [
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
 MEDIA_URL = "/media/"
+# Uploaded logos are staged here for Celery workers to push to S3, so workers
+# must share this directory (same host or a shared volume) with the web process
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Uploads over 1 MB are spooled to a temporary file instead of memory, so
+# S3Service.upload_file can stream them to S3 from disk
+FILE_UPLOAD_MAX_MEMORY_SIZE = 1024 * 1024
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -279,8 +304,9 @@ CSRF_COOKIE_SECURE = True  # Required for SameSite=None to work with cross-site
 SESSION_COOKIE_HTTPONLY = True
 SESSION_COOKIE_AGE = 1209600
 
-# Use database sessions instead of cache for better persistence
-SESSION_ENGINE = "django.contrib.sessions.backends.db"
+# Write-through cached sessions: reads are served from the cache configured
+# above, while every write still lands in the database for persistence
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
 
 CSRF_COOKIE_HTTPONLY = False
 
@@ -38,6 +38,7 @@ except ImportError:
     LANGCHAIN_AVAILABLE = False
 
 from django.contrib.auth.models import User
+from django.db import transaction
 from django.utils import timezone
 
 from .models import AIAgent, Conversation, Message, Document, AgentUsage
@@ -268,13 +269,16 @@ class ConversationMemory:
         self.max_tokens = self.config.get('max_tokens', 4000)
         self.summary_threshold = self.config.get('summary_threshold', 3000)
     
-    def get_conversation_history(self) -> List[Dict[str, str]]:
+    def get_conversation_history(self, recent_messages: Optional[List[Message]] = None) -> List[Dict[str, str]]:
+        """Build the history for this memory's mode; recent_messages, when given,
+        is an already-fetched created_at-ordered message list to build it from"""
         logger.info(f"Fetching conversation history for conversation {self.conversation.id} in mode '{self.mode}'")
         if self.mode == 'stateless':
             logger.info("Mode is 'stateless'; returning empty history.")
             return []
         messages = []
-        recent_messages = list(self.conversation.messages.order_by('created_at'))
+        if recent_messages is None:
+            recent_messages = list(self.conversation.messages.order_by('created_at'))
         logger.info(f"Fetched {len(recent_messages)} messages from DB for conversation {self.conversation.id}")
         if self.mode == 'session':
             session_start = timezone.now() - timedelta(hours=24)
@@ -442,8 +446,16 @@ class AIAgentExecutor:
         return self.rate_limiters[key]
     
     def execute_agent_request(self, agent: AIAgent, user_message: str,
-                                   conversation: Conversation = None) -> Dict[str, Any]:
-        """Execute an AI agent request"""
+                                   conversation: Conversation = None,
+                                   conversation_history: Optional[List[Dict[str, str]]] = None,
+                                   persist: bool = True) -> Dict[str, Any]:
+        """
+        Execute an AI agent request
+        
+        conversation_history replaces the history read from the conversation.
+        With persist=False the exchange is not saved; the caller passes the
+        result to record_exchange once it decides the write order.
+        """
         try:
             start_time = time.time()
             
@@ -472,7 +484,8 @@ class AIAgentExecutor:
             })
             
             # Get conversation history
-            conversation_history = memory.get_conversation_history()
+            if conversation_history is None:
+                conversation_history = memory.get_conversation_history()
             logger.info(f"Conversation history: {conversation_history}")
             
             logger.info(f"Executing agent request for user {agent.user.id}, agent {agent.id}, conversation {conversation.id}")
@@ -562,45 +575,60 @@ class AIAgentExecutor:
             # Calculate response time
             response_time = time.time() - start_time
             
+            result = {
+                'content': response.get('content', ''),
+                'conversation_id': str(conversation.id),
+                'context_docs': context_docs,
+                'response_time': response_time,
+                'usage': response.get('usage', {})
+            }
+            if persist:
+                self.record_exchange(agent, conversation, user_message, result)
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error executing agent request: {e}")
+            return {
+                'error': str(e),
+                'content': f"An error occurred while processing your request: {e}"
+            }
+    
+    def record_exchange(self, agent: AIAgent, conversation: Conversation,
+                        user_message: str, result: Dict[str, Any]):
+        """Save a successful request's messages and usage"""
+        memory = ConversationMemory(conversation, {
+            'mode': agent.conversation_mode,
+            'max_tokens': agent.context_window
+        })
+        usage_data = result.get('usage', {})
+        context_docs = result.get('context_docs', [])
+        
+        # Persist messages and usage in a single transaction; this runs
+        # after the model call so no transaction is held open across it
+        with transaction.atomic():
             # Save messages to memory
             memory.add_message('user', user_message)
-            memory.add_message('assistant', response.get('content', ''), {
+            memory.add_message('assistant', result.get('content', ''), {
                 'context_docs': [doc['id'] for doc in context_docs],
                 'model_info': {
                     'provider': agent.model_provider,
                     'model': agent.model_name,
-                    'usage': response.get('usage', {})
+                    'usage': usage_data
                 }
             })
             
             # Log usage
-            usage_data = response.get('usage', {})
             AgentUsage.objects.create(
                 user=agent.user,
                 agent=agent,
                 tokens_used=usage_data.get('total_tokens', 0),
-                response_time=response_time,
+                response_time=result.get('response_time', 0),
                 request_data={
                     'message_length': len(user_message),
                     'context_docs_count': len(context_docs),
                     'conversation_id': str(conversation.id)
                 }
             )
-            
-            return {
-                'content': response.get('content', ''),
-                'conversation_id': str(conversation.id),
-                'context_docs': context_docs,
-                'response_time': response_time,
-                'usage': usage_data
-            }
-            
-        except Exception as e:
-            logger.error(f"Error executing agent request: {e}")
-            return {
-                'error': str(e),
-                'content': f"An error occurred while processing your request: {e}"
-            }
 
 
 class AgentTemplateManager:
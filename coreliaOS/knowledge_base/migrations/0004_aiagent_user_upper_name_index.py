@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-16 10:00
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('knowledge_base', '0003_rename_connected_account_table'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='aiagent',
+            index=models.Index(models.F('user'), django.db.models.functions.text.Upper('name'), condition=models.Q(('is_active', True)), name='kb_aiagent_user_uname_idx'),
+        ),
+    ]
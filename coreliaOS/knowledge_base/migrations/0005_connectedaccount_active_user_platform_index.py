@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-16 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('knowledge_base', '0004_aiagent_user_upper_name_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='connectedaccount',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user', 'platform'], name='kb_connacct_user_plat_act_idx'),
+        ),
+    ]
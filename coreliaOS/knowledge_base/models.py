@@ -1,8 +1,11 @@
 
 from django.db import models
+from django.db.models import F, Q
+from django.db.models.functions import Upper
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
+from django.utils.functional import cached_property
 import json
 import uuid
 
@@ -324,6 +327,14 @@ class AIAgent(models.Model):
     class Meta:
         unique_together = ['user', 'name']
         ordering = ['-created_at']
+        indexes = [
+            # Serves case-insensitive tag lookups (name__iexact) for active agents
+            models.Index(
+                F('user'), Upper('name'),
+                name='kb_aiagent_user_uname_idx',
+                condition=Q(is_active=True),
+            ),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.agent_type}) - {self.user.username}"
@@ -499,6 +510,14 @@ class ConnectedAccount(models.Model):
                 name='unique_business_platform_account'
             )
         ]
+        indexes = [
+            # Serves the active-account lookup in initialize_instagram_client
+            models.Index(
+                fields=['user', 'platform'],
+                condition=models.Q(is_active=True),
+                name='kb_connacct_user_plat_act_idx'
+            ),
+        ]
     
     def __str__(self):
         if self.user:
@@ -506,10 +525,10 @@ class ConnectedAccount(models.Model):
         else:
             return f"{self.platform.title()} - {self.username} (Business: {self.business_id})"
     
-    @property
+    @cached_property
     def owner_identifier(self):
         """Get a unique identifier for the account owner"""
-        return f"user_{self.user.id}" if self.user else f"business_{self.business_id}"
+        return f"user_{self.user_id}" if self.user_id else f"business_{self.business_id}"
 
 
     
\ No newline at end of file
@@ -4,10 +4,13 @@ AWS S3 service for handling file uploads
 import os
 import uuid
 import boto3
+from boto3.exceptions import S3UploadFailedError
 from botocore.exceptions import ClientError, NoCredentialsError
 from django.conf import settings
+from django.core.cache import cache
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import TemporaryUploadedFile
 import logging
 
 logger = logging.getLogger(__name__)
@@ -67,22 +70,26 @@ class S3Service:
             if not content_type:
                 content_type = self._get_content_type(file.name)
             
-            file.seek(0)
-            file_content = file.read()
-            
-            upload_params = {
-                'Bucket': self.bucket_name,
-                'Key': file_path,
-                'Body': file_content,
-            }
+            extra_args = {}
             
             if content_type:
-                upload_params['ContentType'] = content_type
+                extra_args['ContentType'] = content_type
             
             if settings.AWS_DEFAULT_ACL and settings.AWS_DEFAULT_ACL.lower() not in ['none', '']:
-                upload_params['ACL'] = settings.AWS_DEFAULT_ACL
+                extra_args['ACL'] = settings.AWS_DEFAULT_ACL
             
-            response = self.s3_client.put_object(**upload_params)
+            # Stream the upload (multipart for large files) instead of reading
+            # the whole file into memory; uploads Django spooled to disk are
+            # sent straight from their temporary path
+            if isinstance(file, TemporaryUploadedFile):
+                self.s3_client.upload_file(
+                    file.temporary_file_path(), self.bucket_name, file_path, ExtraArgs=extra_args
+                )
+            else:
+                file.seek(0)
+                self.s3_client.upload_fileobj(
+                    file, self.bucket_name, file_path, ExtraArgs=extra_args
+                )
             
             file_url = self.generate_signed_url(file_path)
             
@@ -96,6 +103,10 @@ class S3Service:
         except NoCredentialsError:
             logger.error("AWS credentials not found or invalid")
             return None
+        except S3UploadFailedError as e:
+            # The managed transfer wraps the underlying ClientError
+            logger.error(f"AWS upload failed: {str(e)}")
+            return None
         except Exception as e:
             logger.error(f"Unexpected error during S3 upload: {str(e)}", exc_info=True)
             return None
@@ -115,7 +126,7 @@ class S3Service:
             logger.error("Service not available - missing AWS credentials")
             return None
         
-        if not self._is_valid_image(file.name):
+        if not self.is_valid_image(file.name):
             logger.error(f"Invalid image file type: {file.name}")
             return None
         
@@ -137,24 +148,56 @@ class S3Service:
         Returns:
             str: Signed URL for accessing the file
         """
-        if not self.is_available():
-            return None
-            
-        try:
-            signed_url = self.s3_client.generate_presigned_url(
-                'get_object',
-                Params={
-                    'Bucket': self.bucket_name, 
-                    'Key': file_path
-                },
-                ExpiresIn=expiration,
-                HttpMethod='GET'
-            )
+        return self.generate_signed_urls([file_path], expiration).get(file_path)
+    
+    def generate_signed_urls(self, file_paths, expiration=604800):
+        """
+        Generate signed URLs for several S3 objects, reusing cached ones
+        
+        A signed URL is cached for half its lifetime, so a cached URL always
+        has at least half of its validity left when it is handed out.
+        
+        Args:
+            file_paths: Iterable of S3 object keys/paths
+            expiration: URL expiration time in seconds
             
-            return signed_url
-        except Exception as e:
-            logger.error(f"Error generating signed URL: {str(e)}")
-            return None
+        Returns:
+            dict: Mapping of file path to signed URL (failed paths are omitted)
+        """
+        if not self.is_available():
+            return {}
+        
+        cache_keys = {
+            f"s3_signed_url:{self.bucket_name}:{expiration}:{file_path}": file_path
+            for file_path in file_paths
+        }
+        cached = cache.get_many(list(cache_keys))
+        signed_urls = {cache_keys[key]: url for key, url in cached.items()}
+        
+        fresh = {}
+        for cache_key, file_path in cache_keys.items():
+            if cache_key in cached:
+                continue
+            try:
+                signed_url = self.s3_client.generate_presigned_url(
+                    'get_object',
+                    Params={
+                        'Bucket': self.bucket_name, 
+                        'Key': file_path
+                    },
+                    ExpiresIn=expiration,
+                    HttpMethod='GET'
+                )
+            except Exception as e:
+                logger.error(f"Error generating signed URL: {str(e)}")
+                continue
+            signed_urls[file_path] = signed_url
+            fresh[cache_key] = signed_url
+        
+        if fresh:
+            cache.set_many(fresh, expiration // 2)
+        
+        return signed_urls
     
     def upload_post_image(self, file, user_id, post_id=None):
         """
@@ -171,7 +214,7 @@ class S3Service:
         if not self.is_available():
             return None
         
-        if not self._is_valid_image(file.name):
+        if not self.is_valid_image(file.name):
             logger.error(f"Invalid image file type: {file.name}")
             return None
         
@@ -270,7 +313,7 @@ class S3Service:
         }
         return content_types.get(extension, 'application/octet-stream')
     
-    def _is_valid_image(self, filename):
+    def is_valid_image(self, filename):
         """Check if file is a valid image type"""
         valid_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg'}
         extension = self._get_file_extension(filename).lower()